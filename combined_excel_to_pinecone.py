@@ -14,18 +14,72 @@ Prerequisites:
     export PINECONE_API_KEY="your-api-key"
     export OPENAI_API_KEY="your-api-key"
 
+    Python 3.10+
     pip install pandas openpyxl pinecone-client openai tqdm python-dotenv
+
+    Optional (5-20x faster Excel parsing):
+    pip install python-calamine
+
+    Optional (JIT-compiled per-employee group sums):
+    pip install numba
+
+    Optional (gRPC upserts, lighter than REST for large vector payloads):
+    pip install "pinecone-client[grpc]"
+
+    Optional (exact token counts for request packing and cost):
+    pip install tiktoken
+
+    Optional (HTTP/2 connections to OpenAI):
+    pip install h2
 """
 
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import io
 import json
+import logging
 import os
+import pickle
+import queue
+import re
+import sqlite3
 import sys
-from typing import Dict, List, Any, Optional
+import threading
+from collections import defaultdict, deque
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Any, Iterable, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
-from tqdm import tqdm
+
+import numpy as np
+
+# pandas, pinecone and openai take ~1s to import, so they are imported inside
+# the functions that use them; `--help` and other early exits skip that cost
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    def tqdm(iterable, **kwargs):
+        """Progress bars are cosmetic; run without them when tqdm is missing"""
+        return iterable
+
+try:
+    # Routes log records through tqdm.write so they don't tear the progress bar
+    from tqdm.contrib.logging import logging_redirect_tqdm
+except ImportError:
+    def logging_redirect_tqdm(**kwargs):
+        """No progress bar to protect; log as usual"""
+        return contextlib.nullcontext()
 
 # Load environment variables from .env file
 try:
@@ -35,678 +89,1395 @@ try:
 except ImportError:
     print("⚠️  python-dotenv not installed, using system environment variables only")
 
-# Check for required packages
-try:
-    from pinecone import Pinecone, ServerlessSpec
-except ImportError:
-    print("❌ Error: pinecone-client not installed")
-    print("Install with: pip install pinecone-client")
-    sys.exit(1)
+# Check for required packages (without importing them yet)
+for _package, _pip_name in (('pandas', 'pandas'), ('pinecone', 'pinecone-client'), ('openai', 'openai')):
+    if importlib.util.find_spec(_package) is None:
+        print(f"❌ Error: {_pip_name} not installed")
+        print(f"Install with: pip install {_pip_name}")
+        sys.exit(1)
 
-try:
-    from openai import OpenAI
-except ImportError:
-    print("❌ Error: openai not installed")
-    print("Install with: pip install openai")
-    sys.exit(1)
+# Prefer the Rust calamine reader for .xlsx when it is installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+# Progress of the Excel processing steps. Quiet (warnings only) when the
+# module is imported; main() raises it to INFO unless --quiet is given
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.WARNING)
 
 
 # =============================================================================
 # PART 1: DATA STRUCTURES
 # =============================================================================
 
+# Amount rendering used throughout the embedding text; binding .format once
+# avoids re-looking-up the method for every amount
+KRW = "{:,.0f}원".format
+
+
+def _group_sums_loop(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-group sum and count of `values`, where codes[i] in [0, n_groups) is row i's group"""
+    totals = np.zeros(n_groups, dtype=np.float64)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(codes.shape[0]):
+        totals[codes[i]] += values[i]
+        counts[codes[i]] += 1
+    return totals, counts
+
+
+def _group_sums_bincount(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    return np.bincount(codes, weights=values, minlength=n_groups), np.bincount(codes, minlength=n_groups)
+
+
+@functools.lru_cache(maxsize=None)
+def _group_sums_impl():
+    """numba-compiled _group_sums_loop if numba is installed, else the np.bincount version"""
+    try:
+        from numba import njit
+    except ImportError:
+        return _group_sums_bincount
+    return njit(cache=True, nogil=True)(_group_sums_loop)
+
+
+def group_sums(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-group sum and count of `values`; both implementations add in row order, so totals match"""
+    return _group_sums_impl()(codes, values, n_groups)
+
+
+# Per-contract records are slotted dataclasses rather than dicts: attribute
+# access skips the string-key hashing and each record carries no __dict__.
+# Fields typed Any hold the raw Excel cell value (text, number or None).
+
+@dataclass(slots=True)
+class CommissionContract:
+    """One 건별수수료 row"""
+    마감월: str
+    보험사: Any
+    증권번호: str
+    계약일: Optional[str]
+    계약상태: Any
+    납입회차: int
+    지급로직: Any
+    납입방법: Any
+    선지급_분급: Any
+    규정: Any
+    배분율: float
+    보험료: float
+    MFYC: float
+    AFYC: float
+    보험사환산: float
+    지급율: float
+    지급수수료_모집: float
+    지급수수료_유지: float
+    지급수수료_자동차: float
+    지급수수료_일반: float
+    지급수수료_합계: float
+    수입수수료_성과: float
+    수입수수료_계약관리: float
+    수입수수료_수금: float
+    수입수수료_자동차: float
+    수입수수료_일반: float
+    수입수수료_합계: float
+    상품군1: Any
+    상품군2: Any
+    상품명: Any
+    계약자: Any
+    피보험자: Any
+    교차판매: Any
+    외부이관: Any
+
+
+@dataclass(slots=True)
+class OverrideRecord:
+    """One 건별OR row, as received (override_received) or as the FC of the contract (override_as_fc)"""
+    마감월: str
+    오버라이드_종류: Any
+    오버라이드_대상자: Any
+    오버라이드_규정: Any
+    FC_사번: str
+    FC_대상자: Any
+    FC_입사차월: int
+    FC_규정: Any
+    보험사: Any
+    증권번호: str
+    계약일: Optional[str]
+    계약상태: Any
+    납입회차: int
+    계산방식: Any
+    납입방법: Any
+    보험료: float
+    MFYC: float
+    AFYC: float
+    LP커미션: float
+    지급율: float
+    오버라이드_금액: float
+    수입수수료_합계: float
+    상품군1: Any
+    상품군2: Any
+    상품명: Any
+    계약자: Any
+    피보험자: Any
+    수령자_사번: Optional[str] = None  # FC side only
+    수령자_이름: Any = None  # FC side only
+
+
+@dataclass(slots=True)
+class PolicyContract:
+    """One 시책건별 row"""
+    마감월: str
+    소속: Any
+    보험사: Any
+    증권번호: str
+    계약일자: Optional[str]
+    납입방법: Any
+    초회보험료: float
+    CMIP: float
+    상품명: Any
+    계약자: Any
+    피보험자: Any
+    납입기간: Any
+    지급시책_법인: float
+    지급시책_사용인: float
+    지급_계: float
+    비고: Any
+
+
+@dataclass(slots=True)
+class PerformanceRecord:
+    """One 업적 row, seen from one of its LP/FC roles (역할)"""
+    역할: str
+    원모집LP: Any
+    수금LP: Any
+    수금자소속: Dict[str, Any]
+    모집LP: Any
+    보험사: Any
+    생손보구분: Any
+    상품군1: Any
+    상품군2: Any
+    증권번호: Optional[str]
+    계약일자: Optional[str]
+    계약상태: Any
+    계약상세상태: Any
+    상태변경일: Optional[str]
+
+
+@dataclass(slots=True)
+class ClawbackRecord:
+    """One row of a 환수 sheet; which optional fields are set depends on 환수유형"""
+    환수유형: str
+    환수금액: float
+    보험사: Any = None
+    증권번호: Optional[str] = None
+    계약일: Optional[str] = None
+    상품명: Any = None
+    계약상태: Any = None
+    초기_월납P: Optional[float] = None
+    변경_월납P: Optional[float] = None
+    도입자사번: Optional[str] = None
+    도입인원: Optional[int] = None
+    위촉일: Optional[str] = None
+    해촉일: Optional[str] = None
+    기준월: Optional[str] = None
+
+class RecordTable:
+    """Column-wise (SoA) store of one record kind across all employees.
+
+    Each field is a single array over every row of the source sheet(s), and
+    `rows[sabon]` is the index array of that employee's rows, in the order
+    of the employee's record list. Employees receive their slices of these
+    columns (see EmployeeDataStructure.attach_columns), so text building and
+    aggregation work on contiguous arrays instead of walking records.
+    """
+
+    def __init__(self, sabons: np.ndarray, columns: Dict[str, np.ndarray]):
+        import pandas as pd
+
+        self.columns = columns
+        codes, uniques = pd.factorize(sabons)
+        self.codes: np.ndarray = codes  # row -> position of its 사번 in self.sabons
+        self.sabons: List[str] = uniques.tolist()
+        order = np.argsort(codes, kind='stable')
+        splits = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+        self.rows: Dict[str, np.ndarray] = dict(zip(self.sabons, np.split(order, splits)))
+
+    def group_totals(self, amount: str, positions: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum of column `amount` and row count per 사번, laid out at positions[사번] (every 사번 must have one)"""
+        codes = np.array([positions[sabon] for sabon in self.sabons], dtype=np.intp)[self.codes]
+        return group_sums(codes, self.columns[amount], len(positions))
+
+
+class RecordRows(Sequence):
+    """One employee's records of one kind, read from RecordTable columns on demand.
+
+    Stands in for the record list of kinds whose table holds every record
+    field (see ExcelDataProcessor.RECORD_TYPES). No per-row object exists
+    until something indexes or iterates the list, such as to_dict(); text
+    building and aggregation read column slices instead.
+    """
+
+    __slots__ = ('record_type', 'columns', 'rows', 'blank', '_records')
+
+    def __init__(self, record_type: type, columns: Dict[str, np.ndarray], rows: np.ndarray, blank: Tuple[str, ...] = ()):
+        self.record_type = record_type
+        self.columns = columns
+        self.rows = rows
+        self.blank = blank  # fields that read as None from this side, though the shared columns hold them
+        self._records: Optional[list] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.records()[index]
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __reduce__(self):
+        # Pickle only this employee's slice (e.g. for build_embedding_texts workers), not the whole table
+        return RecordRows, (
+            self.record_type, {key: self.column(key) for key in self.columns}, np.arange(len(self.rows)), self.blank
+        )
+
+    def column(self, key: str) -> np.ndarray:
+        """Field `key` of these records as an array"""
+        if key in self.blank:
+            return np.full(len(self.rows), None, dtype=object)
+        return self.columns[key][self.rows]
+
+    def records(self) -> list:
+        """The records as record_type instances, built once"""
+        if self._records is None:
+            values = [self.column(field.name).tolist() for field in fields(self.record_type)]
+            self._records = [self.record_type(*row) for row in zip(*values)]
+        return self._records
+
+
 class EmployeeDataStructure:
     """Comprehensive employee data structure for Pinecone"""
 
-    def __init__(self):
-        self.sabon: str = ""  # 사번
+    # employee_profile fields rendered as "<field>: <value>" lines (interned, see ExcelDataProcessor.SUMMARY_COLUMNS)
+    PROFILE_TEXT_FIELDS = tuple(map(sys.intern, ('사원명', '직종', '소속', '소속경로', '위촉일', '위촉구분')))
+    # (label, summary_financials key) pairs rendered as amount lines
+    SUMMARY_TEXT_FIELDS = tuple((label, sys.intern(key)) for label, key in (
+        ('최종지급액', '최종지급액'),
+        ('총 커미션', '총_커미션'),
+        ('총 오버라이드', '총_오버라이드'),
+        ('총 시책금액', '총_시책금액'),
+        ('총 환수금액', '총_환수금액'),
+    ))
+
+    # Both override record lists, read back to back by the text's override section
+    OVERRIDE_LISTS = ('override_received', 'override_as_fc')
+
+    def __init__(self, sabon: str = ""):
+        self.sabon: str = sabon  # 사번
         self.employee_profile: Dict[str, Any] = {}
-        self.commission_contracts: List[Dict[str, Any]] = []
-        self.override_records: List[Dict[str, Any]] = []
-        self.policy_contracts: List[Dict[str, Any]] = []
-        self.performance_records: List[Dict[str, Any]] = []
+        self.commission_contracts: Sequence[CommissionContract] = []
+        self.override_received: Sequence[OverrideRecord] = []  # overrides paid to this employee
+        self.override_as_fc: Sequence[OverrideRecord] = []  # overrides paid to others on this employee's contracts
+        self.policy_contracts: List[PolicyContract] = []
+        self.performance_records: List[PerformanceRecord] = []
         self.additional_allowances: Dict[str, Any] = {}
-        self.clawback_records: List[Dict[str, Any]] = []
+        self.clawback_records: List[ClawbackRecord] = []
         self.summary_financials: Dict[str, float] = {}
+        self._columns: Dict[Tuple[str, str], np.ndarray] = {}  # record fields as arrays, built on first use
+        self._text: Optional[str] = None  # to_text_for_embedding result, built on first use
+
+    def attach_columns(self, attr: str, columns: Dict[str, np.ndarray]):
+        """Seed the column cache of record list `attr` with ready-made arrays, one per field"""
+        for key, column in columns.items():
+            self._columns[(attr, key)] = column
+        self._text = None
+
+    def attach_text(self, text: str):
+        """Seed the embedding text cache with a text built elsewhere (e.g. in a worker process)"""
+        self._text = text
+
+    @property
+    def has_text(self) -> bool:
+        """Whether the embedding text is already built"""
+        return self._text is not None
+
+    def invalidate(self):
+        """Drop the cached embedding text and column arrays after changing this employee's data"""
+        self._columns.clear()
+        self._text = None
+
+    def _column(self, attr, key: str) -> np.ndarray:
+        """Return field `key` of record list `attr` (or of a tuple of lists) as a NumPy array, building it only once"""
+        column = self._columns.get((attr, key))
+        if column is None and isinstance(attr, tuple):
+            column = self._columns[(attr, key)] = self._stacked(attr, [self._column(a, key) for a in attr])
+        elif column is None:
+            records = getattr(self, attr)
+            if isinstance(records, RecordRows):
+                column = self._columns[(attr, key)] = records.column(key)
+            else:
+                column = self._columns[(attr, key)] = np.array([getattr(r, key) for r in records], dtype=object)
+        return column
+
+    def _amounts(self, attr, key: str) -> np.ndarray:
+        """Return numeric field `key` of record list `attr` (or of a tuple of lists) as a float64 array, building it only once"""
+        column = self._columns.get((attr, key))
+        if column is None and isinstance(attr, tuple):
+            column = self._columns[(attr, key)] = self._stacked(attr, [self._amounts(a, key) for a in attr])
+        elif column is None:
+            records = getattr(self, attr)
+            if isinstance(records, RecordRows):
+                column = self._columns[(attr, key)] = records.column(key).astype(np.float64, copy=False)
+            else:
+                column = self._columns[(attr, key)] = np.fromiter(
+                    (getattr(r, key) for r in records), dtype=np.float64, count=len(records)
+                )
+        return column
+
+    def _stacked(self, attrs: Tuple[str, ...], parts: List[np.ndarray]) -> np.ndarray:
+        """Concatenate one field of several record lists, back in sheet order when
+        every list is a RecordRows with a 행번호 (source row) column"""
+        column = np.concatenate(parts)
+        rows = []
+        for attr in attrs:
+            records = getattr(self, attr)
+            rows.append(records.column('행번호') if isinstance(records, RecordRows) and '행번호' in records.columns else None)
+        if all(r is not None for r in rows):
+            column = column[np.argsort(np.concatenate(rows), kind='stable')]
+        return column
+
+    def _group_totals(self, attr, key: str, amount: str) -> List[Tuple[Any, str, int]]:
+        """Sum and count `amount` per `key` of a record list, in first-seen key order.
+
+        Totals come back already formatted with KRW, converted in one pass.
+        """
+        import pandas as pd
+
+        codes, keys = pd.factorize(self._column(attr, key), use_na_sentinel=False)
+        totals, counts = group_sums(codes, self._amounts(attr, amount), len(keys))
+        return [
+            (None if pd.isna(k) else k, total, count)
+            for k, total, count in zip(keys, map(KRW, totals.tolist()), counts.tolist())
+        ]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Pinecone storage"""
         return {
             "sabon": self.sabon,
             "employee_profile": self.employee_profile,
-            "commission_contracts": self.commission_contracts,
-            "override_records": self.override_records,
-            "policy_contracts": self.policy_contracts,
-            "performance_records": self.performance_records,
+            "commission_contracts": [asdict(c) for c in self.commission_contracts],
+            "override_received": [asdict(o) for o in self.override_received],
+            "override_as_fc": [asdict(o) for o in self.override_as_fc],
+            "policy_contracts": [asdict(p) for p in self.policy_contracts],
+            "performance_records": [asdict(p) for p in self.performance_records],
             "additional_allowances": self.additional_allowances,
-            "clawback_records": self.clawback_records,
+            "clawback_records": [asdict(c) for c in self.clawback_records],
             "summary_financials": self.summary_financials
         }
 
     def to_text_for_embedding(self) -> str:
-        """Convert to comprehensive text representation for embedding"""
-        parts = []
+        """Convert to comprehensive text representation for embedding, built once (see invalidate)"""
+        if self._text is None:
+            self._text = self._build_text()
+        return self._text
+
+    def _build_text(self) -> str:
+        # Fast path for employees with nothing but a 사번 (test rows, inactive employees)
+        if not (self.employee_profile or self.summary_financials or self.commission_contracts
+                or self.override_received or self.override_as_fc or self.policy_contracts or self.additional_allowances
+                or self.clawback_records or self.performance_records):
+            return f"사번: {self.sabon}"
+
+        # Every line is written with a trailing newline into one buffer; the
+        # last newline is truncated away at the end
+        buf = io.StringIO()
+        w = buf.write
 
         # Employee Profile
         if self.employee_profile:
-            parts.append(f"사번: {self.sabon}")
-            parts.append(f"사원명: {self.employee_profile.get('사원명', '')}")
-            parts.append(f"직종: {self.employee_profile.get('직종', '')}")
-            parts.append(f"소속: {self.employee_profile.get('소속', '')}")
-            parts.append(f"소속경로: {self.employee_profile.get('소속경로', '')}")
-            parts.append(f"위촉일: {self.employee_profile.get('위촉일', '')}")
-            parts.append(f"위촉구분: {self.employee_profile.get('위촉구분', '')}")
+            profile = self.employee_profile
+            w(f"사번: {self.sabon}\n")
+            for field in self.PROFILE_TEXT_FIELDS:
+                w(f"{field}: {profile.get(field, '')}\n")
 
         # Summary Financials
         if self.summary_financials:
-            parts.append("\n## 재무 요약")
-            parts.append(f"최종지급액: {self.summary_financials.get('최종지급액', 0):,.0f}원")
-            parts.append(f"총 커미션: {self.summary_financials.get('총_커미션', 0):,.0f}원")
-            parts.append(f"총 오버라이드: {self.summary_financials.get('총_오버라이드', 0):,.0f}원")
-            parts.append(f"총 시책금액: {self.summary_financials.get('총_시책금액', 0):,.0f}원")
-            parts.append(f"총 환수금액: {self.summary_financials.get('총_환수금액', 0):,.0f}원")
-
-        # Commission Contracts Summary
+            financials = self.summary_financials
+            w("\n## 재무 요약\n")
+            for label, key in self.SUMMARY_TEXT_FIELDS:
+                w(f"{label}: {KRW(financials.get(key, 0))}\n")
+
+        # Commission Contracts Summary (grouped by insurance company)
         if self.commission_contracts:
-            parts.append(f"\n## 수수료 계약: {len(self.commission_contracts)}건")
-            total_commission = sum(c.get('지급수수료_합계', 0) for c in self.commission_contracts)
-            parts.append(f"총 수수료: {total_commission:,.0f}원")
-
-            # Group by insurance company
-            by_insurer = {}
-            for contract in self.commission_contracts:
-                insurer = contract.get('보험사', '')
-                if insurer not in by_insurer:
-                    by_insurer[insurer] = []
-                by_insurer[insurer].append(contract)
-
-            parts.append("보험사별 계약:")
-            for insurer, contracts in by_insurer.items():
-                count = len(contracts)
-                amount = sum(c.get('지급수수료_합계', 0) for c in contracts)
-                parts.append(f"  - {insurer}: {count}건, {amount:,.0f}원")
-
-        # Override Records
-        if self.override_records:
-            parts.append(f"\n## 오버라이드: {len(self.override_records)}건")
-            total_override = sum(o.get('오버라이드_금액', 0) for o in self.override_records)
-            parts.append(f"총 오버라이드: {total_override:,.0f}원")
-
-            by_type = {}
-            for override in self.override_records:
-                otype = override.get('오버라이드_종류', '')
-                if otype not in by_type:
-                    by_type[otype] = []
-                by_type[otype].append(override)
-
-            for otype, records in by_type.items():
-                count = len(records)
-                amount = sum(r.get('오버라이드_금액', 0) for r in records)
-                parts.append(f"  - {otype}: {count}건, {amount:,.0f}원")
+            total_commission = self._amounts('commission_contracts', '지급수수료_합계').sum()
+            w(f"\n## 수수료 계약: {len(self.commission_contracts)}건\n")
+            w(f"총 수수료: {KRW(total_commission)}\n")
+            w("보험사별 계약:\n")
+            for insurer, amount, count in self._group_totals('commission_contracts', '보험사', '지급수수료_합계'):
+                w(f"  - {insurer}: {count}건, {amount}\n")
+
+        # Override Records (received and as FC)
+        if self.override_received or self.override_as_fc:
+            total_override = self._amounts(self.OVERRIDE_LISTS, '오버라이드_금액').sum()
+            w(f"\n## 오버라이드: {len(self.override_received) + len(self.override_as_fc)}건\n")
+            w(f"총 오버라이드: {KRW(total_override)}\n")
+            for otype, amount, count in self._group_totals(self.OVERRIDE_LISTS, '오버라이드_종류', '오버라이드_금액'):
+                w(f"  - {otype}: {count}건, {amount}\n")
 
         # Policy Contracts
         if self.policy_contracts:
-            parts.append(f"\n## 시책 계약: {len(self.policy_contracts)}건")
-            total_policy = sum(p.get('지급_계', 0) for p in self.policy_contracts)
-            parts.append(f"총 시책금액: {total_policy:,.0f}원")
+            total_policy = self._amounts('policy_contracts', '지급_계').sum()
+            w(f"\n## 시책 계약: {len(self.policy_contracts)}건\n")
+            w(f"총 시책금액: {KRW(total_policy)}\n")
 
         # Additional Allowances
         if self.additional_allowances:
-            parts.append("\n## 추가 수당")
+            w("\n## 추가 수당\n")
             for key, value in self.additional_allowances.items():
-                if isinstance(value, (int, float)) and value > 0:
-                    parts.append(f"  - {key}: {value:,.0f}원")
-                elif isinstance(value, dict) and value.get('금액', 0) > 0:
-                    parts.append(f"  - {key}: {value.get('금액', 0):,.0f}원")
+                amount = value if isinstance(value, (int, float)) else value.get('금액', 0) if isinstance(value, dict) else 0
+                if amount > 0:
+                    w(f"  - {key}: {KRW(amount)}\n")
 
         # Clawback Records
         if self.clawback_records:
-            parts.append(f"\n## 환수 기록: {len(self.clawback_records)}건")
-            total_clawback = sum(c.get('환수금액', 0) for c in self.clawback_records)
-            parts.append(f"총 환수금액: {total_clawback:,.0f}원")
-
-            by_type = {}
-            for clawback in self.clawback_records:
-                ctype = clawback.get('환수유형', '')
-                if ctype not in by_type:
-                    by_type[ctype] = 0
-                by_type[ctype] += clawback.get('환수금액', 0)
-
-            for ctype, amount in by_type.items():
-                parts.append(f"  - {ctype}: {amount:,.0f}원")
+            total_clawback = self._amounts('clawback_records', '환수금액').sum()
+            w(f"\n## 환수 기록: {len(self.clawback_records)}건\n")
+            w(f"총 환수금액: {KRW(total_clawback)}\n")
+            for ctype, amount, _ in self._group_totals('clawback_records', '환수유형', '환수금액'):
+                w(f"  - {ctype}: {amount}\n")
 
         # Performance Summary
         if self.performance_records:
-            parts.append(f"\n## 업적 기록: {len(self.performance_records)}건")
+            w(f"\n## 업적 기록: {len(self.performance_records)}건\n")
 
-        return "\n".join(parts)
+        buf.truncate(buf.tell() - 1)
+        return buf.getvalue()
+
+
+class EmployeeRegistry(dict):
+    """사번 -> EmployeeDataStructure; looking up a new 사번 creates its employee.
+
+    One hash lookup per row replaces the `if sabon not in ...` / assign /
+    fetch sequence every sheet processor used to repeat.
+    """
+
+    def __missing__(self, sabon: str) -> EmployeeDataStructure:
+        emp = self[sabon] = EmployeeDataStructure(sabon)
+        return emp
+
+    def add_all(self, sabons: Iterable[str]):
+        """Create the employees of `sabons` that don't exist yet, in first-seen order"""
+        for sabon in dict.fromkeys(sabons):
+            if sabon not in self:
+                self[sabon] = EmployeeDataStructure(sabon)
 
 
 # =============================================================================
 # PART 2: EXCEL PROCESSOR
 # =============================================================================
 
+# Below this many employees, building embedding texts in worker processes costs more than it saves
+# (~0.3 ms of text per employee against ~0.5 s to spawn each worker and import this module)
+PARALLEL_TEXT_MIN_EMPLOYEES = 20000
+
+# Metadata fields every Pinecone vector leads with; the rest follow only when not None
+PINECONE_LEADING_METADATA = frozenset(('사번', '사원명', 'doc_type'))
+
+
+def pinecone_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata to upsert with `doc`'s vector"""
+    metadata = doc['metadata']
+    return {
+        '사번': metadata['사번'],
+        '사원명': metadata['사원명'],
+        'doc_type': doc['doc_type'],
+        **{k: v for k, v in metadata.items() if k not in PINECONE_LEADING_METADATA and v is not None}
+    }
+
+
+class _ColumnArrays(dict):
+    """Column name -> object array of one sheet; absent columns read as all-None"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], none: np.ndarray):
+        super().__init__(columns)
+        self.none = none
+
+    def __missing__(self, name: str) -> np.ndarray:
+        return self.none
+
+    def present(self, name: str) -> np.ndarray:
+        """Boolean mask of the rows whose `name` cell is not missing, computed over the whole column at once"""
+        return np.not_equal(self[name], None)
+
+    def present_rows(self, name: str) -> List[int]:
+        """Positions of the rows whose `name` cell is not missing"""
+        return np.flatnonzero(self.present(name)).tolist()
+
+
 class ExcelDataProcessor:
     """Process Excel sheets and create employee-centric data structures"""
 
-    def __init__(self, excel_path: str):
+    # Every sheet process_all reads, with its header row
+    SHEET_HEADERS = {
+        '인별명세': 0,
+        '건별수수료': 0,
+        '건별OR': 0,
+        '시책건별': 0,
+        '업적': 2,
+        '시책2 인별명세': 4,
+        '손보EXT': 4,
+        '수당_신입IP(2025위촉)': 5,
+        'MGR상생(BM)': 4,
+        '13회차 유지(4%)': 4,
+        '환수_시책2지급분_완료': 5,
+        '환수_소개비_완료': 5,
+        '환수_교육비_완료': 18,
+    }
+
+    # employee_profile key -> 인별명세 column, in profile order (마감월 and 조직 follow)
+    PROFILE_COLUMNS = {
+        '사원명': '사원명',
+        '직종': '직종',
+        'Career_Path': 'Career Path',
+        '소속': '소속',
+        '소속경로': '소속경로',
+        '위촉구분': '위촉구분',
+        '위촉일': '위촉일',
+        '영업개시일': '영업개시일',
+        '퇴사일자': '퇴사일자',
+        '부지급여부': '부지급여부',
+        '계좌번호': '계좌번호',
+        '은행': '은행',
+    }
+
+    # employee_profile['조직'] key -> 인별명세 column
+    ORGANIZATION_COLUMNS = {
+        '회사': '현재 소속경로_회사',
+        '구분': '현재 소속경로_구분',
+        '본부': '현재 소속경로_본부',
+        '사업단': '현재 소속경로_사업단',
+        'Agency': '현재 소속경로_Agency',
+        '팀': '현재 소속경로_팀',
+    }
+
+    # summary_financials key -> 인별명세 column. Both are interned (as are the
+    # column labels of every sheet read), so the lookups here and in
+    # to_text_for_embedding usually succeed on pointer identity rather than
+    # comparing multi-byte strings, which Python does not intern on its own.
+    SUMMARY_COLUMNS = {sys.intern(key): sys.intern(column) for key, column in (
+        ('최종지급액', '최종지급액'),
+        ('커미션계', '커미션계'),
+        ('FC_커미션계', 'FC 커미션계'),
+        ('FC계약모집_커미션', 'FC계약모집 커미션Ⅱ'),
+        ('현금시책', '현금시책'),
+        ('FC계약유지_커미션', 'FC계약유지 및 서비스 커미션Ⅱ'),
+        ('오버라이드계', '오버라이드계'),
+        ('BM_오버라이드', 'BM 오버라이드Ⅱ'),
+        ('MD_오버라이드', 'MD 오버라이드Ⅱ'),
+        ('사업단장_오버라이드', '사업단장 오버라이드Ⅱ'),
+        ('지사장_오버라이드', '지사장 오버라이드Ⅱ'),
+        ('유치자_오버라이드', '유치자 오버라이드Ⅱ'),
+        ('공통커미션계', '공통커미션계'),
+        ('Account_Balance_당월적립액', 'Account Balance 당월적립액'),
+        ('Account_Balance_지급액', 'Account Balance 지급액'),
+        ('이월_보수_환수금액', '이월 보수 환수금액'),
+        ('미환수_유보금액', '미환수 유보금액'),
+        ('기타커미션계', '기타커미션계'),
+        ('지사지급', '지사지급'),
+        ('과세계', '과세계'),
+        ('공제계', '공제계'),
+        ('소득세', '소득세'),
+        ('주민세', '주민세'),
+        ('원천세', '원천세'),
+        ('근로산재보험료', '근로산재보험료'),
+        ('고용보험료', '고용보험료'),
+    )}
+
+    # Record lists whose RecordTable holds every field of the record type, so
+    # employees get RecordRows views instead of per-row record objects:
+    # record list -> (record type, fields that read as None from that side)
+    RECORD_TYPES = {
+        'commission_contracts': (CommissionContract, ()),
+        'override_received': (OverrideRecord, ('수령자_사번', '수령자_이름')),
+        'override_as_fc': (OverrideRecord, ()),
+    }
+
+    # (record list, amount field, summary_financials total key, count key)
+    AGGREGATES = (
+        ('commission_contracts', '지급수수료_합계', '총_커미션', '계약건수'),
+        ('override_received', '오버라이드_금액', '총_오버라이드', '오버라이드건수'),
+        ('policy_contracts', '지급_계', '총_시책금액', '시책계약건수'),
+        ('clawback_records', '환수금액', '총_환수금액', '환수건수'),
+    )
+
+    # Numeric columns of each sheet, parsed as float64 in one pass when the
+    # sheet is read; blank or unparsable cells (and absent columns) become 0.0
+    NUMERIC_COLUMNS = {
+        '인별명세': tuple(SUMMARY_COLUMNS.values()),
+        '건별수수료': (
+            '처리납입회차', '배분율', '보험료', 'MFYC', 'AFYC', '보험사환산', '지급율',
+            '[지급수수료] 모집', '[지급수수료] 유지', '[지급수수료] 자동차', '[지급수수료] 일반', '[지급수수료] 합계',
+            '[수입수수료] 성과', '[수입수수료] 계약관리', '[수입수수료] 수금', '[수입수수료] 자동차',
+            '[수입수수료] 일반', '[수입수수료] 합계',
+        ),
+        '건별OR': (
+            '[FC] 입사차월', '처리납입회차', '보험료', 'MFYC', 'AFYC', 'LP커미션',
+            '[지급수수료] 지급율', '[지급수수료] 오버라이드', '[수입수수료] 합계',
+        ),
+        '시책건별': ('초회보험료', 'CMIP', '지급시책\n_법인', '지급시책\n_사용인', '지급 계'),
+        '시책2 인별명세': ('지급액',),
+        '손보EXT': ('손보시책 Ext',),
+        '수당_신입IP(2025위촉)': ('지급액', '모집(환산)업적', '지급대상액'),
+        'MGR상생(BM)': ('활성화 지원금', '총 모집업적\n(생,손보)', '손보모집업적(①)', '지급율(%)'),
+        '13회차 유지(4%)': ('회차', '추가지급율', '지급액'),
+        '환수_시책2지급분_완료': ('초기_월납P', '변경_월납P', '지급액'),
+        '환수_소개비_완료': ('도입인원', '환수대상액'),
+        '환수_교육비_완료': ('환수대상액',),
+    }
+
+    # Columns of each sheet stored as str(cell), converted in one pass when the
+    # sheet is read; missing cells stay missing, so they read as None
+    STRING_COLUMNS = {
+        '인별명세': ('위촉일', '영업개시일', '퇴사일자', '계좌번호'),
+        '건별수수료': ('계약일',),
+        '건별OR': ('계약일',),
+        '시책건별': ('계약일자',),
+        '업적': ('수금LP사번', '모집LP사번', '원모집FC사번', '증권번호', '계약일자', '상태변경일'),
+        '시책2 인별명세': ('FC 사번',),
+        '손보EXT': ('FC 사번',),
+        '수당_신입IP(2025위촉)': ('FC 사번',),
+        'MGR상생(BM)': ('사번',),
+        '13회차 유지(4%)': ('FC 사번', '증번', '계약일'),
+        '환수_시책2지급분_완료': ('사번', '증번', '계약일'),
+        '환수_소개비_완료': ('사번', '도입자사번', '위촉일', '해촉일'),
+        '환수_교육비_완료': ('사번', '위촉일', '해촉일', '기준월'),
+    }
+
+    # Low-cardinality text columns of each sheet, read as pandas categoricals:
+    # each distinct value is stored once and rows hold small integer codes
+    CATEGORY_COLUMNS = {
+        '인별명세': ('직종', 'Career Path', '소속', '소속경로', '위촉구분', '부지급여부', '은행'),
+        '건별수수료': (
+            '보험사', '처리계약상태', '지급로직', '납입방법', '선지급/분급', '규정', '상품군1', '상품군2', '교차판매',
+        ),
+        '건별OR': (
+            '[오버라이드] 종류', '[오버라이드] 규정', '[FC] 규정', '보험사', '처리계약상태', '계산방식', '납입방법',
+            '상품군1', '상품군2',
+        ),
+        '시책건별': ('소속', '보험사', '납입\n방법'),
+        '업적': ('보험사', '생손보구분', '상품군1', '상품군2', '계약상태', '계약상세상태'),
+    }
+
+    # Columns of each sheet read as they are. Together with the NUMERIC,
+    # STRING and CATEGORY columns these are everything the sheet's processor
+    # reads; other columns are dropped while parsing (see _usecols)
+    RAW_COLUMNS = {
+        '인별명세': ('사번', '사원명', '마감월', *ORGANIZATION_COLUMNS.values()),
+        '건별수수료': ('지급사원번호', '마감월', '증권번호', '상품명', '계약자', '피보험자', '외부이관'),
+        '건별OR': (
+            '[오버라이드] 대상자사번', '[오버라이드] 대상자', '[FC] 대상자사번', '[FC] 대상자', '마감월', '증권번호',
+            '상품명', '계약자', '피보험자',
+        ),
+        '시책건별': ('사번', '마감월', '증권번호', '상품명', '계약자', '피보험자', '납입기간', '비고'),
+        '업적': (
+            '원모집LP', '수금LP', '수금자소속1', '수금자소속2', '수금자소속3', '수금자소속4', '수금자소속5',
+            '수금자소속6', '모집LP',
+        ),
+        '시책2 인별명세': ('비고',),
+        '손보EXT': ('비고',),
+        'MGR상생(BM)': (),
+        '수당_신입IP(2025위촉)': (),
+        '13회차 유지(4%)': ('보험사', '상품명', '비고'),
+        '환수_시책2지급분_완료': ('보험사', '상품명', '계약상태'),
+        '환수_소개비_완료': (),
+        '환수_교육비_완료': (),
+    }
+
+    def __init__(self, excel_path: str, sheet_cache_path: Optional[str] = None):
         self.excel_path = excel_path
-        self.xl = pd.ExcelFile(excel_path)
-        self.employees: Dict[str, EmployeeDataStructure] = {}
+        # Open workbook per thread, on first use (see _workbook)
+        self._local = threading.local()
+        # Parsed sheets are pickled here and reused while the workbook is unchanged (see load_sheet_cache).
+        # They include personal data (계좌번호 etc.), so the file is owner-only; keep it out of shared folders
+        self.sheet_cache_path = sheet_cache_path
+        self._sheets: Dict[Tuple[str, int], pd.DataFrame] = {}  # parsed sheets kept for the sheet cache
+        self._failed_reads: Set[Tuple[str, int]] = set()  # (sheet, header) reads that errored; never cached, so retried next run
+        self.employees: Dict[str, EmployeeDataStructure] = EmployeeRegistry()
+        self._prefetched: Dict[Tuple[str, int], Future] = {}  # in-flight sheet reads, see prefetch_sheets
+        self.tables: Dict[str, RecordTable] = {}  # record list name -> its columns, see build_record_tables
+        self._table_parts: Dict[str, List[Tuple[List[str], Dict[str, np.ndarray]]]] = {}
+
+    @property
+    def xl(self) -> pd.ExcelFile:
+        """The calling thread's open workbook"""
+        return self._workbook()
+
+    def _workbook(self) -> pd.ExcelFile:
+        """This thread's open workbook.
+
+        Opening parses the ZIP directory and shared-string table, so it is
+        done once per thread rather than once per sheet. A handle can't be
+        shared across threads: calamine's raises "Already mutably borrowed"
+        and openpyxl's serializes on its ZIP reader.
+        """
+        import pandas as pd
+
+        xl = getattr(self._local, 'xl', None)
+        if xl is None:
+            xl = self._local.xl = pd.ExcelFile(self.excel_path, engine=EXCEL_ENGINE)
+        return xl
+
+    def _read_sheet(self, sheet_name: str, header: int = 0, **kwargs) -> pd.DataFrame:
+        """Read a sheet from the workbook, returning an empty frame on error"""
+        import pandas as pd
 
-    def safe_read_sheet(self, sheet_name: str, header: int = 0, **kwargs) -> pd.DataFrame:
-        """Safely read a sheet with error handling"""
         try:
-            df = pd.read_excel(self.excel_path, sheet_name=sheet_name, header=header, **kwargs)
-            df = df.replace({np.nan: None})
+            kwargs.setdefault('usecols', self._usecols(sheet_name))
+            df = self._workbook().parse(sheet_name, header=header, **kwargs)
+            df.columns = [sys.intern(c) if isinstance(c, str) else c for c in df.columns]
+            self._coerce_numeric(df, self.NUMERIC_COLUMNS.get(sheet_name, ()))
+            self._stringify(df, self.STRING_COLUMNS.get(sheet_name, ()))
+            self._categorize(df, self.CATEGORY_COLUMNS.get(sheet_name, ()))
             return df
         except Exception as e:
-            print(f"  ⚠ Error reading sheet {sheet_name}: {e}")
+            logger.warning("  ⚠ Error reading sheet %s: %s", sheet_name, e)
+            self._failed_reads.add((sheet_name, header))
             return pd.DataFrame()
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _usecols(cls, sheet_name: str) -> Optional[Callable[[Any], bool]]:
+        """usecols filter keeping the columns the sheet's processor reads, or None (all columns) for unknown sheets.
+
+        A callable rather than a list, so a column missing from the workbook
+        reads as None like before instead of failing the whole sheet.
+        """
+        if sheet_name not in cls.RAW_COLUMNS:
+            return None
+        return frozenset(
+            column
+            for columns in (cls.RAW_COLUMNS, cls.NUMERIC_COLUMNS, cls.STRING_COLUMNS, cls.CATEGORY_COLUMNS)
+            for column in columns.get(sheet_name, ())
+        ).__contains__
+
+    @staticmethod
+    def _coerce_numeric(df: pd.DataFrame, columns: Iterable[str]):
+        """Parse `columns` of `df` as float64 in place; blanks, text and absent columns become 0.0"""
+        import pandas as pd
+
+        for name in columns:
+            if name in df.columns:
+                df[name] = pd.to_numeric(df[name], errors='coerce').fillna(0.0).astype(np.float64)
+            else:
+                df[name] = 0.0
+
+    @staticmethod
+    def _stringify(df: pd.DataFrame, columns: Iterable[str]):
+        """Convert the present cells of `columns` of `df` to str in place; missing cells and absent columns are left alone"""
+        for name in columns:
+            if name in df.columns:
+                df[name] = df[name].map(str, na_action='ignore')
+
+    @staticmethod
+    def _categorize(df: pd.DataFrame, columns: Iterable[str]):
+        """Convert `columns` of `df` to the category dtype in place; absent columns are left alone"""
+        for name in columns:
+            if name in df.columns:
+                df[name] = df[name].astype('category')
+
+    def safe_read_sheet(self, sheet_name: str, header: int = 0, **kwargs) -> pd.DataFrame:
+        """Safely read a sheet with error handling, from the sheet cache or its prefetch when there is one"""
+        if kwargs:
+            return self._read_sheet(sheet_name, header, **kwargs)
+
+        key = (sheet_name, header)
+        df = self._sheets.get(key)
+        if df is None:
+            future = self._prefetched.pop(key, None)
+            df = future.result() if future is not None else self._read_sheet(sheet_name, header)
+            # A failed read's empty frame is not cached, so later runs retry it and warn again
+            if self.sheet_cache_path and key not in self._failed_reads:
+                self._sheets[key] = df
+        return df
+
+    def _sheet_cache_key(self) -> Tuple[Any, ...]:
+        """What the cached sheets depend on: the workbook's mtime and size, the column lists that shape
+        each parsed frame, the Excel engine that parsed them and the pandas version that pickled them"""
+        import pandas as pd
+
+        stat = os.stat(self.excel_path)
+        layout = repr((
+            self.SHEET_HEADERS, self.RAW_COLUMNS, self.NUMERIC_COLUMNS, self.STRING_COLUMNS, self.CATEGORY_COLUMNS
+        ))
+        return stat.st_mtime_ns, stat.st_size, hashlib.sha256(layout.encode()).hexdigest(), EXCEL_ENGINE, pd.__version__
+
+    def load_sheet_cache(self) -> bool:
+        """Load the parsed sheets pickled by an earlier run, if they are still current.
+
+        Unpickling the frames takes a fraction of a second where parsing the
+        workbook takes minutes. Any change to the file (mtime or size) or to
+        the sheet layout above means a full re-read.
+
+        Unpickling runs code from the file, so a cache is only read if this
+        user owns it and nobody else can write to it, and only after its JSON
+        header matches the workbook. A stale cache is deleted.
+        """
+        path = self.sheet_cache_path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+                    logger.warning("  ⚠ Ignoring sheet cache %s: it is not private to this user", path)
+                    return False
+                current = json.loads(f.readline()) == list(self._sheet_cache_key())
+                sheets = pickle.load(f) if current else None
+        except Exception as e:
+            logger.warning("  ⚠ Ignoring unreadable sheet cache %s: %s", path, e)
+            return False
+        if not current:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            return False
+
+        self._sheets = sheets
+        logger.info("Loaded %s parsed sheets from %s\n", len(self._sheets), path)
+        return True
+
+    def save_sheet_cache(self):
+        """Pickle the sheets parsed this run to sheet_cache_path (owner-only), replacing any earlier cache atomically"""
+        path = self.sheet_cache_path
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or '.', mode=0o700, exist_ok=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            # Created 0600 rather than chmod-ed afterwards, so the data is never readable by others
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb') as f:
+                # A JSON header, so load_sheet_cache can check the cache is current without unpickling
+                f.write(json.dumps(list(self._sheet_cache_key())).encode() + b"\n")
+                pickle.dump(self._sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            logger.info("Saved %s parsed sheets to %s", len(self._sheets), path)
+        except OSError as e:
+            logger.warning("  ⚠ Could not write sheet cache %s: %s", path, e)
+
+    def prefetch_sheets(self, max_workers: int = 8):
+        """Start reading every sheet in SHEET_HEADERS on a thread pool, in processing order.
+
+        Decompression and XML parsing inside the Excel engine release the GIL,
+        so total read time approaches that of the largest sheet. This returns
+        immediately: each process_* step waits only for its own sheet, so
+        processing the first sheets overlaps reading the rest. Sheets missing
+        from the workbook are left for safe_read_sheet to report in context.
+        """
+        sheets = [(name, header) for name, header in self.SHEET_HEADERS.items() if name in self.xl.sheet_names]
+        if not sheets:
+            return
+
+        logger.info("Reading %s sheets in parallel...\n", len(sheets))
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(sheets)))
+        self._prefetched.update((sheet, executor.submit(self._read_sheet, *sheet)) for sheet in sheets)
+        # Queued reads still run; the worker threads exit once the queue is drained
+        executor.shutdown(wait=False)
+
+    @classmethod
+    def _column_arrays(cls, df: pd.DataFrame, required: Tuple[str, ...] = ()) -> _ColumnArrays:
+        """Every column of `df` as an object array, so rows are read by position instead of via iterrows().
+
+        Missing cells and columns absent from the sheet read as None, like
+        row.get(); a missing `required` column is a KeyError, like row[...]
+        was, unless the sheet has no rows at all.
+        """
+        missing = [name for name in required if name not in df.columns]
+        if missing and len(df):
+            raise KeyError(missing[0])
+        return _ColumnArrays(
+            {name: cls._cells(df[name]) for name in df.columns},
+            none=np.full(len(df), None, dtype=object)
+        )
+
+    @staticmethod
+    def _dict_records(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """One dict per row of equal-length `columns`, keyed like `columns`, built by DataFrame.to_dict in one call"""
+        import pandas as pd
+
+        # dtype=object keeps the cells as they are (None stays None, str stays str)
+        return pd.DataFrame(columns, dtype=object).to_dict(orient='records')
+
+    @staticmethod
+    def _as_str(cells: np.ndarray) -> np.ndarray:
+        """str() of every cell, missing ones included ('None'), as an object array"""
+        return np.array(list(map(str, cells)), dtype=object)
+
+    @staticmethod
+    def _cells(column: pd.Series) -> np.ndarray:
+        """`column` as an object array with missing cells (NaN, NaT) as None.
+
+        Sheets keep their native dtypes; NaN only becomes None here, for the
+        cells that are actually read, rather than upcasting whole frames.
+        Categorical columns are expanded by indexing their categories with
+        the codes, so every row shares one object per distinct value.
+        """
+        import pandas as pd
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Missing cells have code -1, which picks the None appended last
+            return np.append(column.cat.categories.to_numpy(dtype=object), None)[column.cat.codes.to_numpy()]
+
+        cells = column.to_numpy(dtype=object)
+        missing = column.isna().to_numpy()
+        # to_numpy() may return a read-only view of the frame, so don't write into it
+        return np.where(missing, None, cells) if missing.any() else cells
+
     def process_individual_statements(self):
         """Process 인별명세 (Individual Statement)"""
-        print("Processing 인별명세 (Individual Statement)...")
+        logger.info("Processing 인별명세 (Individual Statement)...")
         df = self.safe_read_sheet('인별명세')
 
-        for _, row in df.iterrows():
-            sabon = str(row['사번'])
-            if sabon not in self.employees:
-                self.employees[sabon] = EmployeeDataStructure()
+        cols = self._column_arrays(df, required=('사번',))
+        sabons = [str(sabon) for sabon in cols['사번']]
+        profiles = self._dict_records({
+            **{key: cols[column] for key, column in self.PROFILE_COLUMNS.items()},
+            '마감월': self._as_str(cols['마감월']),
+        })
+        organizations = self._dict_records({key: cols[column] for key, column in self.ORGANIZATION_COLUMNS.items()})
+        financials = self._dict_records({key: cols[column] for key, column in self.SUMMARY_COLUMNS.items()})
 
+        for sabon, profile, organization, summary in zip(sabons, profiles, organizations, financials):
             emp = self.employees[sabon]
-            emp.sabon = sabon
-
-            emp.employee_profile = {
-                '사원명': row.get('사원명'),
-                '직종': row.get('직종'),
-                'Career_Path': row.get('Career Path'),
-                '소속': row.get('소속'),
-                '소속경로': row.get('소속경로'),
-                '위촉구분': row.get('위촉구분'),
-                '위촉일': str(row.get('위촉일')) if pd.notna(row.get('위촉일')) else None,
-                '영업개시일': str(row.get('영업개시일')) if pd.notna(row.get('영업개시일')) else None,
-                '퇴사일자': str(row.get('퇴사일자')) if pd.notna(row.get('퇴사일자')) else None,
-                '부지급여부': row.get('부지급여부'),
-                '계좌번호': str(row.get('계좌번호')) if pd.notna(row.get('계좌번호')) else None,
-                '은행': row.get('은행'),
-                '마감월': str(row.get('마감월')),
-                '조직': {
-                    '회사': row.get('현재 소속경로_회사'),
-                    '구분': row.get('현재 소속경로_구분'),
-                    '본부': row.get('현재 소속경로_본부'),
-                    '사업단': row.get('현재 소속경로_사업단'),
-                    'Agency': row.get('현재 소속경로_Agency'),
-                    '팀': row.get('현재 소속경로_팀')
-                }
-            }
+            profile['조직'] = organization
+            emp.employee_profile = profile
+            emp.summary_financials = summary
 
-            emp.summary_financials = {
-                '최종지급액': float(row.get('최종지급액', 0) or 0),
-                '커미션계': float(row.get('커미션계', 0) or 0),
-                'FC_커미션계': float(row.get('FC 커미션계', 0) or 0),
-                'FC계약모집_커미션': float(row.get('FC계약모집 커미션Ⅱ', 0) or 0),
-                '현금시책': float(row.get('현금시책', 0) or 0),
-                'FC계약유지_커미션': float(row.get('FC계약유지 및 서비스 커미션Ⅱ', 0) or 0),
-                '오버라이드계': float(row.get('오버라이드계', 0) or 0),
-                'BM_오버라이드': float(row.get('BM 오버라이드Ⅱ', 0) or 0),
-                'MD_오버라이드': float(row.get('MD 오버라이드Ⅱ', 0) or 0),
-                '사업단장_오버라이드': float(row.get('사업단장 오버라이드Ⅱ', 0) or 0),
-                '지사장_오버라이드': float(row.get('지사장 오버라이드Ⅱ', 0) or 0),
-                '유치자_오버라이드': float(row.get('유치자 오버라이드Ⅱ', 0) or 0),
-                '공통커미션계': float(row.get('공통커미션계', 0) or 0),
-                'Account_Balance_당월적립액': float(row.get('Account Balance 당월적립액', 0) or 0),
-                'Account_Balance_지급액': float(row.get('Account Balance 지급액', 0) or 0),
-                '이월_보수_환수금액': float(row.get('이월 보수 환수금액', 0) or 0),
-                '미환수_유보금액': float(row.get('미환수 유보금액', 0) or 0),
-                '기타커미션계': float(row.get('기타커미션계', 0) or 0),
-                '지사지급': float(row.get('지사지급', 0) or 0),
-                '과세계': float(row.get('과세계', 0) or 0),
-                '공제계': float(row.get('공제계', 0) or 0),
-                '소득세': float(row.get('소득세', 0) or 0),
-                '주민세': float(row.get('주민세', 0) or 0),
-                '원천세': float(row.get('원천세', 0) or 0),
-                '근로산재보험료': float(row.get('근로산재보험료', 0) or 0),
-                '고용보험료': float(row.get('고용보험료', 0) or 0)
-            }
-
-        print(f"  ✓ Processed {len(self.employees)} employees")
+        logger.info("  ✓ Processed %s employees", len(self.employees))
 
     def process_commission_contracts(self):
         """Process 건별수수료 (Commission by Contract)"""
-        print("Processing 건별수수료 (Commission by Contract)...")
+        logger.info("Processing 건별수수료 (Commission by Contract)...")
         df = self.safe_read_sheet('건별수수료')
 
-        contract_count = 0
-        for _, row in df.iterrows():
-            sabon = str(row['지급사원번호'])
-            if sabon not in self.employees:
-                self.employees[sabon] = EmployeeDataStructure()
-                self.employees[sabon].sabon = sabon
-
-            emp = self.employees[sabon]
-
-            contract = {
-                '마감월': str(row.get('마감월')),
-                '보험사': row.get('보험사'),
-                '증권번호': str(row.get('증권번호')),
-                '계약일': str(row.get('계약일')) if pd.notna(row.get('계약일')) else None,
-                '계약상태': row.get('처리계약상태'),
-                '납입회차': int(row.get('처리납입회차', 0) or 0),
-                '지급로직': row.get('지급로직'),
-                '납입방법': row.get('납입방법'),
-                '선지급_분급': row.get('선지급/분급'),
-                '규정': row.get('규정'),
-                '배분율': float(row.get('배분율', 0) or 0),
-                '보험료': float(row.get('보험료', 0) or 0),
-                'MFYC': float(row.get('MFYC', 0) or 0),
-                'AFYC': float(row.get('AFYC', 0) or 0),
-                '보험사환산': float(row.get('보험사환산', 0) or 0),
-                '지급율': float(row.get('지급율', 0) or 0),
-                '지급수수료_모집': float(row.get('[지급수수료] 모집', 0) or 0),
-                '지급수수료_유지': float(row.get('[지급수수료] 유지', 0) or 0),
-                '지급수수료_자동차': float(row.get('[지급수수료] 자동차', 0) or 0),
-                '지급수수료_일반': float(row.get('[지급수수료] 일반', 0) or 0),
-                '지급수수료_합계': float(row.get('[지급수수료] 합계', 0) or 0),
-                '수입수수료_성과': float(row.get('[수입수수료] 성과', 0) or 0),
-                '수입수수료_계약관리': float(row.get('[수입수수료] 계약관리', 0) or 0),
-                '수입수수료_수금': float(row.get('[수입수수료] 수금', 0) or 0),
-                '수입수수료_자동차': float(row.get('[수입수수료] 자동차', 0) or 0),
-                '수입수수료_일반': float(row.get('[수입수수료] 일반', 0) or 0),
-                '수입수수료_합계': float(row.get('[수입수수료] 합계', 0) or 0),
-                '상품군1': row.get('상품군1'),
-                '상품군2': row.get('상품군2'),
-                '상품명': row.get('상품명'),
-                '계약자': row.get('계약자'),
-                '피보험자': row.get('피보험자'),
-                '교차판매': row.get('교차판매'),
-                '외부이관': row.get('외부이관')
-            }
-
-            emp.commission_contracts.append(contract)
-            contract_count += 1
-
-        print(f"  ✓ Processed {contract_count} commission contracts")
+        # Rows stay in column form: each employee gets a RecordRows view of
+        # its rows (see build_record_tables) instead of one object per row
+        cols = self._column_arrays(df, required=('지급사원번호',))
+        sabons = [str(sabon) for sabon in cols['지급사원번호']]
+        self.employees.add_all(sabons)
+
+        self._add_table_rows('commission_contracts', sabons, {
+            '마감월': self._as_str(cols['마감월']),
+            '보험사': cols['보험사'],
+            '증권번호': self._as_str(cols['증권번호']),
+            '계약일': cols['계약일'],
+            '계약상태': cols['처리계약상태'],
+            '납입회차': cols['처리납입회차'].astype(np.int64),
+            '지급로직': cols['지급로직'],
+            '납입방법': cols['납입방법'],
+            '선지급_분급': cols['선지급/분급'],
+            '규정': cols['규정'],
+            **{field: cols[name].astype(np.float64) for field, name in (
+                ('배분율', '배분율'),
+                ('보험료', '보험료'),
+                ('MFYC', 'MFYC'),
+                ('AFYC', 'AFYC'),
+                ('보험사환산', '보험사환산'),
+                ('지급율', '지급율'),
+                ('지급수수료_모집', '[지급수수료] 모집'),
+                ('지급수수료_유지', '[지급수수료] 유지'),
+                ('지급수수료_자동차', '[지급수수료] 자동차'),
+                ('지급수수료_일반', '[지급수수료] 일반'),
+                ('지급수수료_합계', '[지급수수료] 합계'),
+                ('수입수수료_성과', '[수입수수료] 성과'),
+                ('수입수수료_계약관리', '[수입수수료] 계약관리'),
+                ('수입수수료_수금', '[수입수수료] 수금'),
+                ('수입수수료_자동차', '[수입수수료] 자동차'),
+                ('수입수수료_일반', '[수입수수료] 일반'),
+                ('수입수수료_합계', '[수입수수료] 합계'),
+            )},
+            '상품군1': cols['상품군1'],
+            '상품군2': cols['상품군2'],
+            '상품명': cols['상품명'],
+            '계약자': cols['계약자'],
+            '피보험자': cols['피보험자'],
+            '교차판매': cols['교차판매'],
+            '외부이관': cols['외부이관'],
+        })
+        logger.info("  ✓ Processed %s commission contracts", len(sabons))
 
     def process_override_records(self):
         """Process 건별OR (Override by Contract)"""
-        print("Processing 건별OR (Override by Contract)...")
+        logger.info("Processing 건별OR (Override by Contract)...")
         df = self.safe_read_sheet('건별OR')
 
-        override_count = 0
-        for _, row in df.iterrows():
-            receiver_sabon = str(row['[오버라이드] 대상자사번'])
-            if receiver_sabon not in self.employees:
-                self.employees[receiver_sabon] = EmployeeDataStructure()
-                self.employees[receiver_sabon].sabon = receiver_sabon
-
-            emp = self.employees[receiver_sabon]
-
-            override = {
-                '마감월': str(row.get('마감월')),
-                '역할': 'receiver',
-                '오버라이드_종류': row.get('[오버라이드] 종류'),
-                '오버라이드_대상자': row.get('[오버라이드] 대상자'),
-                '오버라이드_규정': row.get('[오버라이드] 규정'),
-                'FC_사번': str(row.get('[FC] 대상자사번')),
-                'FC_대상자': row.get('[FC] 대상자'),
-                'FC_입사차월': int(row.get('[FC] 입사차월', 0) or 0),
-                'FC_규정': row.get('[FC] 규정'),
-                '보험사': row.get('보험사'),
-                '증권번호': str(row.get('증권번호')),
-                '계약일': str(row.get('계약일')) if pd.notna(row.get('계약일')) else None,
-                '계약상태': row.get('처리계약상태'),
-                '납입회차': int(row.get('처리납입회차', 0) or 0),
-                '계산방식': row.get('계산방식'),
-                '납입방법': row.get('납입방법'),
-                '보험료': float(row.get('보험료', 0) or 0),
-                'MFYC': float(row.get('MFYC', 0) or 0),
-                'AFYC': float(row.get('AFYC', 0) or 0),
-                'LP커미션': float(row.get('LP커미션', 0) or 0),
-                '지급율': float(row.get('[지급수수료] 지급율', 0) or 0),
-                '오버라이드_금액': float(row.get('[지급수수료] 오버라이드', 0) or 0),
-                '수입수수료_합계': float(row.get('[수입수수료] 합계', 0) or 0),
-                '상품군1': row.get('상품군1'),
-                '상품군2': row.get('상품군2'),
-                '상품명': row.get('상품명'),
-                '계약자': row.get('계약자'),
-                '피보험자': row.get('피보험자')
-            }
-
-            emp.override_records.append(override)
-            override_count += 1
-
-            # Also track in FC's record
-            fc_sabon = str(row['[FC] 대상자사번'])
-            if fc_sabon not in self.employees:
-                self.employees[fc_sabon] = EmployeeDataStructure()
-                self.employees[fc_sabon].sabon = fc_sabon
-
-            fc_emp = self.employees[fc_sabon]
-            fc_override = override.copy()
-            fc_override['역할'] = 'fc'
-            fc_override['수령자_사번'] = receiver_sabon
-            fc_override['수령자_이름'] = row.get('[오버라이드] 대상자')
-            fc_emp.override_records.append(fc_override)
-
-        print(f"  ✓ Processed {override_count} override records")
+        # Each row is both the receiver's override_received record and the
+        # FC's override_as_fc record: both tables index the same columns, and
+        # the receiver side reads 수령자_* as None (see RECORD_TYPES)
+        cols = self._column_arrays(df, required=('[오버라이드] 대상자사번', '[FC] 대상자사번'))
+        receiver_sabons = [str(sabon) for sabon in cols['[오버라이드] 대상자사번']]
+        fc_sabons = [str(sabon) for sabon in cols['[FC] 대상자사번']]
+        self.employees.add_all(sabon for pair in zip(receiver_sabons, fc_sabons) for sabon in pair)
+
+        columns = {
+            # 행번호 lets the text interleave an employee's received and FC-side records in sheet order
+            '행번호': np.arange(len(receiver_sabons)),
+            '마감월': self._as_str(cols['마감월']),
+            '오버라이드_종류': cols['[오버라이드] 종류'],
+            '오버라이드_대상자': cols['[오버라이드] 대상자'],
+            '오버라이드_규정': cols['[오버라이드] 규정'],
+            'FC_사번': np.array(fc_sabons, dtype=object),
+            'FC_대상자': cols['[FC] 대상자'],
+            'FC_입사차월': cols['[FC] 입사차월'].astype(np.int64),
+            'FC_규정': cols['[FC] 규정'],
+            '보험사': cols['보험사'],
+            '증권번호': self._as_str(cols['증권번호']),
+            '계약일': cols['계약일'],
+            '계약상태': cols['처리계약상태'],
+            '납입회차': cols['처리납입회차'].astype(np.int64),
+            '계산방식': cols['계산방식'],
+            '납입방법': cols['납입방법'],
+            **{field: cols[name].astype(np.float64) for field, name in (
+                ('보험료', '보험료'),
+                ('MFYC', 'MFYC'),
+                ('AFYC', 'AFYC'),
+                ('LP커미션', 'LP커미션'),
+                ('지급율', '[지급수수료] 지급율'),
+                ('오버라이드_금액', '[지급수수료] 오버라이드'),
+                ('수입수수료_합계', '[수입수수료] 합계'),
+            )},
+            '상품군1': cols['상품군1'],
+            '상품군2': cols['상품군2'],
+            '상품명': cols['상품명'],
+            '계약자': cols['계약자'],
+            '피보험자': cols['피보험자'],
+            '수령자_사번': np.array(receiver_sabons, dtype=object),
+            '수령자_이름': cols['[오버라이드] 대상자'],
+        }
+        self._add_table_rows('override_received', receiver_sabons, columns)
+        self._add_table_rows('override_as_fc', fc_sabons, columns)
+        logger.info("  ✓ Processed %s override records", len(receiver_sabons))
 
     def process_policy_contracts(self):
         """Process 시책건별 (Policy by Contract)"""
-        print("Processing 시책건별 (Policy by Contract)...")
+        logger.info("Processing 시책건별 (Policy by Contract)...")
         df = self.safe_read_sheet('시책건별')
 
         policy_count = 0
-        for _, row in df.iterrows():
-            sabon = str(row['사번'])
-            if sabon not in self.employees:
-                self.employees[sabon] = EmployeeDataStructure()
-                self.employees[sabon].sabon = sabon
-
+        cols = self._column_arrays(df, required=('사번',))
+        sabons = [str(sabon) for sabon in cols['사번']]
+        for i, sabon in enumerate(sabons):
             emp = self.employees[sabon]
 
-            policy = {
-                '마감월': str(row.get('마감월')),
-                '소속': row.get('소속'),
-                '보험사': row.get('보험사'),
-                '증권번호': str(row.get('증권번호')),
-                '계약일자': str(row.get('계약일자')) if pd.notna(row.get('계약일자')) else None,
-                '납입방법': row.get('납입\n방법'),
-                '초회보험료': float(row.get('초회보험료', 0) or 0),
-                'CMIP': float(row.get('CMIP', 0) or 0),
-                '상품명': row.get('상품명'),
-                '계약자': row.get('계약자'),
-                '피보험자': row.get('피보험자'),
-                '납입기간': row.get('납입기간'),
-                '지급시책_법인': float(row.get('지급시책\n_법인', 0) or 0),
-                '지급시책_사용인': float(row.get('지급시책\n_사용인', 0) or 0),
-                '지급_계': float(row.get('지급 계', 0) or 0),
-                '비고': row.get('비고')
-            }
+            policy = PolicyContract(
+                마감월=str(cols['마감월'][i]),
+                소속=cols['소속'][i],
+                보험사=cols['보험사'][i],
+                증권번호=str(cols['증권번호'][i]),
+                계약일자=cols['계약일자'][i],
+                납입방법=cols['납입\n방법'][i],
+                초회보험료=cols['초회보험료'][i],
+                CMIP=cols['CMIP'][i],
+                상품명=cols['상품명'][i],
+                계약자=cols['계약자'][i],
+                피보험자=cols['피보험자'][i],
+                납입기간=cols['납입기간'][i],
+                지급시책_법인=cols['지급시책\n_법인'][i],
+                지급시책_사용인=cols['지급시책\n_사용인'][i],
+                지급_계=cols['지급 계'][i],
+                비고=cols['비고'][i]
+            )
 
             emp.policy_contracts.append(policy)
             policy_count += 1
 
-        print(f"  ✓ Processed {policy_count} policy contracts")
+        self._add_table_rows('policy_contracts', sabons, {'지급_계': cols['지급 계'].astype(np.float64)})
+        logger.info("  ✓ Processed %s policy contracts", policy_count)
 
     def process_performance_records(self):
         """Process 업적 (Performance)"""
-        print("Processing 업적 (Performance)...")
+        logger.info("Processing 업적 (Performance)...")
         try:
             df = self.safe_read_sheet('업적', header=2)
 
             performance_count = 0
-            for _, row in df.iterrows():
-                sabon_fields = ['수금LP사번', '모집LP사번', '원모집FC사번']
-
-                for field in sabon_fields:
-                    if field in row and pd.notna(row[field]):
-                        sabon = str(row[field])
-                        if sabon not in self.employees:
-                            self.employees[sabon] = EmployeeDataStructure()
-                            self.employees[sabon].sabon = sabon
-
+            cols = self._column_arrays(df)
+            sabon_fields = [
+                (field, cols.present(field)) for field in ('수금LP사번', '모집LP사번', '원모집FC사번') if field in cols
+            ]
+            for i in range(len(df)):
+                for field, present in sabon_fields:
+                    if present[i]:
+                        sabon = cols[field][i]
                         emp = self.employees[sabon]
 
-                        perf = {
-                            '역할': field.replace('사번', ''),
-                            '원모집LP': row.get('원모집LP'),
-                            '수금LP': row.get('수금LP'),
-                            '수금자소속': {
-                                '소속1': row.get('수금자소속1'),
-                                '소속2': row.get('수금자소속2'),
-                                '소속3': row.get('수금자소속3'),
-                                '소속4': row.get('수금자소속4'),
-                                '소속5': row.get('수금자소속5'),
-                                '소속6': row.get('수금자소속6')
+                        perf = PerformanceRecord(
+                            역할=field.replace('사번', ''),
+                            원모집LP=cols['원모집LP'][i],
+                            수금LP=cols['수금LP'][i],
+                            수금자소속={
+                                '소속1': cols['수금자소속1'][i],
+                                '소속2': cols['수금자소속2'][i],
+                                '소속3': cols['수금자소속3'][i],
+                                '소속4': cols['수금자소속4'][i],
+                                '소속5': cols['수금자소속5'][i],
+                                '소속6': cols['수금자소속6'][i]
                             },
-                            '모집LP': row.get('모집LP'),
-                            '보험사': row.get('보험사'),
-                            '생손보구분': row.get('생손보구분'),
-                            '상품군1': row.get('상품군1'),
-                            '상품군2': row.get('상품군2'),
-                            '증권번호': str(row.get('증권번호')) if pd.notna(row.get('증권번호')) else None,
-                            '계약일자': str(row.get('계약일자')) if pd.notna(row.get('계약일자')) else None,
-                            '계약상태': row.get('계약상태'),
-                            '계약상세상태': row.get('계약상세상태'),
-                            '상태변경일': str(row.get('상태변경일')) if pd.notna(row.get('상태변경일')) else None
-                        }
+                            모집LP=cols['모집LP'][i],
+                            보험사=cols['보험사'][i],
+                            생손보구분=cols['생손보구분'][i],
+                            상품군1=cols['상품군1'][i],
+                            상품군2=cols['상품군2'][i],
+                            증권번호=cols['증권번호'][i],
+                            계약일자=cols['계약일자'][i],
+                            계약상태=cols['계약상태'][i],
+                            계약상세상태=cols['계약상세상태'][i],
+                            상태변경일=cols['상태변경일'][i]
+                        )
 
                         emp.performance_records.append(perf)
                         performance_count += 1
 
-            print(f"  ✓ Processed {performance_count} performance records")
+            logger.info("  ✓ Processed %s performance records", performance_count)
         except Exception as e:
-            print(f"  ⚠ Error processing performance records: {e}")
+            logger.warning("  ⚠ Error processing performance records: %s", e)
 
     def process_additional_allowances(self):
         """Process additional allowance sheets"""
-        print("Processing additional allowances...")
+        logger.info("Processing additional allowances...")
 
         # 시책2 인별명세
         try:
             df = self.safe_read_sheet('시책2 인별명세', header=4)
-            for _, row in df.iterrows():
-                if 'FC 사번' in df.columns and pd.notna(row.get('FC 사번')):
-                    sabon = str(row['FC 사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-                    emp.additional_allowances['시책2_지사시책'] = {
-                        '금액': float(row.get('지급액', 0) or 0),
-                        '비고': row.get('비고')
-                    }
-            print("  ✓ Processed 시책2 인별명세")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('FC 사번'):
+                sabon = cols['FC 사번'][i]
+                emp = self.employees[sabon]
+                emp.additional_allowances['시책2_지사시책'] = {
+                    '금액': cols['지급액'][i],
+                    '비고': cols['비고'][i]
+                }
+            logger.info("  ✓ Processed 시책2 인별명세")
         except Exception as e:
-            print(f"  ⚠ Error processing 시책2 인별명세: {e}")
+            logger.warning("  ⚠ Error processing 시책2 인별명세: %s", e)
 
         # 손보EXT
         try:
             df = self.safe_read_sheet('손보EXT', header=4)
-            for _, row in df.iterrows():
-                if 'FC 사번' in df.columns and pd.notna(row.get('FC 사번')):
-                    sabon = str(row['FC 사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-                    emp.additional_allowances['손보EXT'] = {
-                        '금액': float(row.get('손보시책 Ext', 0) or 0),
-                        '비고': row.get('비고')
-                    }
-            print("  ✓ Processed 손보EXT")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('FC 사번'):
+                sabon = cols['FC 사번'][i]
+                emp = self.employees[sabon]
+                emp.additional_allowances['손보EXT'] = {
+                    '금액': cols['손보시책 Ext'][i],
+                    '비고': cols['비고'][i]
+                }
+            logger.info("  ✓ Processed 손보EXT")
         except Exception as e:
-            print(f"  ⚠ Error processing 손보EXT: {e}")
+            logger.warning("  ⚠ Error processing 손보EXT: %s", e)
 
         # 수당_신입IP
         try:
             df = self.safe_read_sheet('수당_신입IP(2025위촉)', header=5)
-            for _, row in df.iterrows():
-                if 'FC 사번' in df.columns and pd.notna(row.get('FC 사번')):
-                    sabon = str(row['FC 사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-                    emp.additional_allowances['신입IP수당'] = {
-                        '금액': float(row.get('지급액', 0) or 0),
-                        '모집업적': float(row.get('모집(환산)업적', 0) or 0),
-                        '지급대상액': float(row.get('지급대상액', 0) or 0)
-                    }
-            print("  ✓ Processed 수당_신입IP")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('FC 사번'):
+                sabon = cols['FC 사번'][i]
+                emp = self.employees[sabon]
+                emp.additional_allowances['신입IP수당'] = {
+                    '금액': cols['지급액'][i],
+                    '모집업적': cols['모집(환산)업적'][i],
+                    '지급대상액': cols['지급대상액'][i]
+                }
+            logger.info("  ✓ Processed 수당_신입IP")
         except Exception as e:
-            print(f"  ⚠ Error processing 수당_신입IP: {e}")
+            logger.warning("  ⚠ Error processing 수당_신입IP: %s", e)
 
         # MGR상생(BM)
         try:
             df = self.safe_read_sheet('MGR상생(BM)', header=4)
-            for _, row in df.iterrows():
-                if '사번' in df.columns and pd.notna(row.get('사번')):
-                    sabon = str(row['사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-                    emp.additional_allowances['MGR상생'] = {
-                        '금액': float(row.get('활성화 지원금', 0) or 0),
-                        '총_모집업적': float(row.get('총 모집업적\n(생,손보)', 0) or 0),
-                        '손보모집업적': float(row.get('손보모집업적(①)', 0) or 0),
-                        '지급율': float(row.get('지급율(%)', 0) or 0)
-                    }
-            print("  ✓ Processed MGR상생(BM)")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('사번'):
+                sabon = cols['사번'][i]
+                emp = self.employees[sabon]
+                emp.additional_allowances['MGR상생'] = {
+                    '금액': cols['활성화 지원금'][i],
+                    '총_모집업적': cols['총 모집업적\n(생,손보)'][i],
+                    '손보모집업적': cols['손보모집업적(①)'][i],
+                    '지급율': cols['지급율(%)'][i]
+                }
+            logger.info("  ✓ Processed MGR상생(BM)")
         except Exception as e:
-            print(f"  ⚠ Error processing MGR상생(BM): {e}")
+            logger.warning("  ⚠ Error processing MGR상생(BM): %s", e)
 
         # 13회차 유지(4%)
         try:
             df = self.safe_read_sheet('13회차 유지(4%)', header=4)
-            for _, row in df.iterrows():
-                if 'FC 사번' in df.columns and pd.notna(row.get('FC 사번')):
-                    sabon = str(row['FC 사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    retention = {
-                        '보험사': row.get('보험사'),
-                        '증권번호': str(row.get('증번')) if pd.notna(row.get('증번')) else None,
-                        '계약일': str(row.get('계약일')) if pd.notna(row.get('계약일')) else None,
-                        '회차': int(row.get('회차', 0) or 0),
-                        '상품명': row.get('상품명'),
-                        '추가지급율': float(row.get('추가지급율', 0) or 0),
-                        '지급액': float(row.get('지급액', 0) or 0),
-                        '비고': row.get('비고')
-                    }
-
-                    emp = self.employees[sabon]
-                    if '13회차유지' not in emp.additional_allowances:
-                        emp.additional_allowances['13회차유지'] = []
-                    emp.additional_allowances['13회차유지'].append(retention)
-
-            print("  ✓ Processed 13회차 유지(4%)")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('FC 사번'):
+                sabon = cols['FC 사번'][i]
+                retention = {
+                    '보험사': cols['보험사'][i],
+                    '증권번호': cols['증번'][i],
+                    '계약일': cols['계약일'][i],
+                    '회차': int(cols['회차'][i]),
+                    '상품명': cols['상품명'][i],
+                    '추가지급율': cols['추가지급율'][i],
+                    '지급액': cols['지급액'][i],
+                    '비고': cols['비고'][i]
+                }
+
+                emp = self.employees[sabon]
+                emp.additional_allowances.setdefault('13회차유지', []).append(retention)
+
+            logger.info("  ✓ Processed 13회차 유지(4%)")
         except Exception as e:
-            print(f"  ⚠ Error processing 13회차 유지(4%): {e}")
+            logger.warning("  ⚠ Error processing 13회차 유지(4%%): %s", e)
 
     def process_clawback_records(self):
         """Process clawback (환수) sheets"""
-        print("Processing clawback records...")
+        logger.info("Processing clawback records...")
 
         # 환수_시책2지급분_완료
         try:
             df = self.safe_read_sheet('환수_시책2지급분_완료', header=5)
-            for _, row in df.iterrows():
-                if '사번' in df.columns and pd.notna(row.get('사번')):
-                    sabon = str(row['사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-
-                    clawback = {
-                        '환수유형': '시책2지급분',
-                        '보험사': row.get('보험사'),
-                        '증권번호': str(row.get('증번')) if pd.notna(row.get('증번')) else None,
-                        '계약일': str(row.get('계약일')) if pd.notna(row.get('계약일')) else None,
-                        '상품명': row.get('상품명'),
-                        '계약상태': row.get('계약상태'),
-                        '초기_월납P': float(row.get('초기_월납P', 0) or 0),
-                        '변경_월납P': float(row.get('변경_월납P', 0) or 0),
-                        '환수금액': float(row.get('지급액', 0) or 0)
-                    }
-
-                    emp.clawback_records.append(clawback)
-            print("  ✓ Processed 환수_시책2지급분_완료")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('사번'):
+                sabon = cols['사번'][i]
+                emp = self.employees[sabon]
+
+                clawback = ClawbackRecord(
+                    환수유형='시책2지급분',
+                    보험사=cols['보험사'][i],
+                    증권번호=cols['증번'][i],
+                    계약일=cols['계약일'][i],
+                    상품명=cols['상품명'][i],
+                    계약상태=cols['계약상태'][i],
+                    초기_월납P=cols['초기_월납P'][i],
+                    변경_월납P=cols['변경_월납P'][i],
+                    환수금액=cols['지급액'][i]
+                )
+
+                emp.clawback_records.append(clawback)
+            self._add_clawback_rows(cols, '시책2지급분', '지급액')
+            logger.info("  ✓ Processed 환수_시책2지급분_완료")
         except Exception as e:
-            print(f"  ⚠ Error processing 환수_시책2지급분_완료: {e}")
+            logger.warning("  ⚠ Error processing 환수_시책2지급분_완료: %s", e)
 
         # 환수_소개비_완료
         try:
             df = self.safe_read_sheet('환수_소개비_완료', header=5)
-            for _, row in df.iterrows():
-                if '사번' in df.columns and pd.notna(row.get('사번')):
-                    sabon = str(row['사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-
-                    clawback = {
-                        '환수유형': '소개비',
-                        '도입자사번': str(row.get('도입자사번')) if pd.notna(row.get('도입자사번')) else None,
-                        '도입인원': int(row.get('도입인원', 0) or 0),
-                        '위촉일': str(row.get('위촉일')) if pd.notna(row.get('위촉일')) else None,
-                        '해촉일': str(row.get('해촉일')) if pd.notna(row.get('해촉일')) else None,
-                        '환수금액': float(row.get('환수대상액', 0) or 0),
-                    }
-
-                    emp.clawback_records.append(clawback)
-            print("  ✓ Processed 환수_소개비_완료")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('사번'):
+                sabon = cols['사번'][i]
+                emp = self.employees[sabon]
+
+                clawback = ClawbackRecord(
+                    환수유형='소개비',
+                    도입자사번=cols['도입자사번'][i],
+                    도입인원=int(cols['도입인원'][i]),
+                    위촉일=cols['위촉일'][i],
+                    해촉일=cols['해촉일'][i],
+                    환수금액=cols['환수대상액'][i]
+                )
+
+                emp.clawback_records.append(clawback)
+            self._add_clawback_rows(cols, '소개비', '환수대상액')
+            logger.info("  ✓ Processed 환수_소개비_완료")
         except Exception as e:
-            print(f"  ⚠ Error processing 환수_소개비_완료: {e}")
+            logger.warning("  ⚠ Error processing 환수_소개비_완료: %s", e)
 
         # 환수_교육비_완료
         try:
             df = self.safe_read_sheet('환수_교육비_완료', header=18)
-            for _, row in df.iterrows():
-                if '사번' in df.columns and pd.notna(row.get('사번')):
-                    sabon = str(row['사번'])
-                    if sabon not in self.employees:
-                        self.employees[sabon] = EmployeeDataStructure()
-                        self.employees[sabon].sabon = sabon
-
-                    emp = self.employees[sabon]
-
-                    clawback = {
-                        '환수유형': '교육비',
-                        '위촉일': str(row.get('위촉일')) if pd.notna(row.get('위촉일')) else None,
-                        '해촉일': str(row.get('해촉일')) if pd.notna(row.get('해촉일')) else None,
-                        '환수금액': float(row.get('환수대상액', 0) or 0),
-                        '기준월': str(row.get('기준월')) if pd.notna(row.get('기준월')) else None,
-                    }
-
-                    emp.clawback_records.append(clawback)
-            print("  ✓ Processed 환수_교육비_완료")
+            cols = self._column_arrays(df)
+            for i in cols.present_rows('사번'):
+                sabon = cols['사번'][i]
+                emp = self.employees[sabon]
+
+                clawback = ClawbackRecord(
+                    환수유형='교육비',
+                    위촉일=cols['위촉일'][i],
+                    해촉일=cols['해촉일'][i],
+                    환수금액=cols['환수대상액'][i],
+                    기준월=cols['기준월'][i]
+                )
+
+                emp.clawback_records.append(clawback)
+            self._add_clawback_rows(cols, '교육비', '환수대상액')
+            logger.info("  ✓ Processed 환수_교육비_완료")
         except Exception as e:
-            print(f"  ⚠ Error processing 환수_교육비_완료: {e}")
+            logger.warning("  ⚠ Error processing 환수_교육비_완료: %s", e)
+
+    def _add_table_rows(self, attr: str, sabons: List[str], columns: Dict[str, np.ndarray]):
+        """Queue one sheet's rows for the RecordTable of record list `attr` (see build_record_tables)"""
+        self._table_parts.setdefault(attr, []).append((sabons, columns))
+
+    def _add_clawback_rows(self, cols: _ColumnArrays, clawback_type: str, amount_column: str):
+        """Queue the rows of one 환수 sheet that have a 사번 for the clawback RecordTable"""
+        present = cols.present('사번')
+        self._add_table_rows('clawback_records', cols['사번'][present].tolist(), {
+            '환수유형': np.full(int(present.sum()), clawback_type, dtype=object),
+            '환수금액': cols[amount_column][present].astype(np.float64),
+        })
+
+    def build_record_tables(self):
+        """Assemble each record kind's RecordTable and hand every employee its rows of it.
+
+        Kinds in RECORD_TYPES become RecordRows views; for the others each
+        employee gets its column slices, unless its record list doesn't line
+        up with the table (a sheet that failed part-way) and it is left to
+        build its columns from the records.
+        """
+        for attr, parts in self._table_parts.items():
+            sabons = np.array([sabon for part_sabons, _ in parts for sabon in part_sabons], dtype=object)
+            # A single sheet's columns are used as they are, so tables queued
+            # with the same columns (the two override sides) share them
+            if len(parts) == 1:
+                columns = parts[0][1]
+            else:
+                columns = {key: np.concatenate([part[key] for _, part in parts]) for key in parts[0][1]}
+            table = self.tables[attr] = RecordTable(sabons, columns)
+
+            record_type, blank = self.RECORD_TYPES.get(attr, (None, ()))
+            for sabon, rows in table.rows.items():
+                emp = self.employees[sabon]
+                if record_type is not None:
+                    setattr(emp, attr, RecordRows(record_type, columns, rows, blank))
+                elif len(rows) == len(getattr(emp, attr)):
+                    emp.attach_columns(attr, {key: column[rows] for key, column in columns.items()})
+        self._table_parts.clear()
 
     def calculate_aggregated_financials(self):
         """Calculate aggregated financial summaries for each employee"""
-        print("Calculating aggregated financials...")
-
-        for sabon, emp in self.employees.items():
-            총_커미션 = sum(c.get('지급수수료_합계', 0) for c in emp.commission_contracts)
-            총_오버라이드 = sum(
-                o.get('오버라이드_금액', 0)
-                for o in emp.override_records
-                if o.get('역할') == 'receiver'
-            )
-            총_시책금액 = sum(p.get('지급_계', 0) for p in emp.policy_contracts)
-            총_환수금액 = sum(c.get('환수금액', 0) for c in emp.clawback_records)
+        logger.info("Calculating aggregated financials...")
+
+        # One compiled group-sum per record kind over its RecordTable, laid out
+        # in employee order so the results are written back in a single pass
+        positions = {sabon: k for k, sabon in enumerate(self.employees)}
+        totals, counts = [], []
+        for attr, amount, _, _ in self.AGGREGATES:
+            table = self.tables.get(attr)
+            if table is None:
+                kind_totals, kind_counts = np.zeros(len(positions)), np.zeros(len(positions), dtype=np.int64)
+            else:
+                kind_totals, kind_counts = table.group_totals(amount, positions)
+            # Employees without records of this kind keep an integer 0, as sum() of nothing gives
+            kind_totals = kind_totals.astype(object)
+            kind_totals[kind_counts == 0] = 0
+            totals.append(kind_totals.tolist())
+            counts.append(kind_counts.tolist())
 
-            emp.summary_financials['총_커미션'] = 총_커미션
-            emp.summary_financials['총_오버라이드'] = 총_오버라이드
-            emp.summary_financials['총_시책금액'] = 총_시책금액
-            emp.summary_financials['총_환수금액'] = 총_환수금액
-            emp.summary_financials['계약건수'] = len(emp.commission_contracts)
-            emp.summary_financials['오버라이드건수'] = len([o for o in emp.override_records if o.get('역할') == 'receiver'])
-            emp.summary_financials['시책계약건수'] = len(emp.policy_contracts)
-            emp.summary_financials['환수건수'] = len(emp.clawback_records)
+        keys = [total_key for _, _, total_key, _ in self.AGGREGATES] + [count_key for *_, count_key in self.AGGREGATES]
+        for emp, values in zip(self.employees.values(), zip(*totals, *counts)):
+            emp.summary_financials.update(zip(keys, values))
 
-        print(f"  ✓ Calculated financials for {len(self.employees)} employees")
+        logger.info("  ✓ Calculated financials for %s employees", len(self.employees))
 
     def process_all(self):
         """Process all sheets in order"""
-        print("\n" + "="*80)
-        print("STEP 1: PROCESSING EXCEL DATA")
-        print("="*80 + "\n")
-
+        logger.info("\n" + "="*80)
+        logger.info("STEP 1: PROCESSING EXCEL DATA")
+        logger.info("="*80 + "\n")
+
+        from_cache = self.load_sheet_cache()
+        cached_sheets = len(self._sheets)
+        if not from_cache:
+            self.prefetch_sheets()
         self.process_individual_statements()
         self.process_commission_contracts()
         self.process_override_records()
@@ -714,38 +1485,72 @@ class ExcelDataProcessor:
         self.process_performance_records()
         self.process_additional_allowances()
         self.process_clawback_records()
+        # Also re-saved when a sheet that failed to read last time was read now
+        if self.sheet_cache_path and len(self._sheets) > cached_sheets:
+            self.save_sheet_cache()
+        self._sheets = {}
+        self.build_record_tables()
         self.calculate_aggregated_financials()
 
-        print("\n" + "="*80)
-        print(f"EXCEL PROCESSING COMPLETE: {len(self.employees)} employees")
-        print("="*80 + "\n")
+        logger.info("\n" + "="*80)
+        logger.info("EXCEL PROCESSING COMPLETE: %s employees", len(self.employees))
+        logger.info("="*80 + "\n")
 
         return self.employees
 
+    def build_embedding_texts(self, processes: Optional[int] = None) -> List[str]:
+        """Build every employee's embedding text, in self.employees order.
+
+        Text building is pure-Python string work, so large runs are spread
+        across worker processes; small runs stay in-process where pickling
+        the employees would cost more than it saves.
+        """
+        import multiprocessing as mp
+
+        employees = list(self.employees.values())
+        pending = [emp for emp in employees if not emp.has_text]  # texts already built are reused
+        processes = processes or os.cpu_count() or 1
+
+        if processes > 1 and len(pending) >= PARALLEL_TEXT_MIN_EMPLOYEES:
+            # Spawned, not forked: main's uploader setup thread may hold locks or a gRPC channel by now
+            with mp.get_context("spawn").Pool(processes) as pool:
+                texts = pool.map(EmployeeDataStructure.to_text_for_embedding, pending, chunksize=64)
+            for emp, text in zip(pending, texts):
+                emp.attach_text(text)
+
+        return [emp.to_text_for_embedding() for emp in employees]
+
     def generate_employee_centric_documents(self) -> List[Dict[str, Any]]:
-        """Generate employee-centric documents for Pinecone upload"""
-        documents = []
+        """Generate employee-centric documents for Pinecone upload.
 
-        for sabon, emp in self.employees.items():
-            # Create main profile document
-            doc = {
+        Each document carries its ready-made upsert metadata under
+        '_pinecone_metadata', so the upload loop doesn't rebuild it.
+        """
+        texts = self.build_embedding_texts()
+
+        # One profile document per employee; profile and financials are bound once per employee
+        documents = [
+            {
                 'id': f"{sabon}_profile",
                 'doc_type': 'employee_profile',
-                'text': emp.to_text_for_embedding(),
+                'text': text,
                 'metadata': {
                     '사번': sabon,
-                    '사원명': emp.employee_profile.get('사원명', ''),
-                    '직종': emp.employee_profile.get('직종', ''),
-                    '소속': emp.employee_profile.get('소속', ''),
-                    '위촉일': emp.employee_profile.get('위촉일', ''),
-                    '최종지급액': emp.summary_financials.get('최종지급액', 0),
-                    '총_커미션': emp.summary_financials.get('총_커미션', 0),
-                    '총_오버라이드': emp.summary_financials.get('총_오버라이드', 0),
-                    '계약건수': emp.summary_financials.get('계약건수', 0),
+                    '사원명': profile.get('사원명', ''),
+                    '직종': profile.get('직종', ''),
+                    '소속': profile.get('소속', ''),
+                    '위촉일': profile.get('위촉일', ''),
+                    '최종지급액': financials.get('최종지급액', 0),
+                    '총_커미션': financials.get('총_커미션', 0),
+                    '총_오버라이드': financials.get('총_오버라이드', 0),
+                    '계약건수': financials.get('계약건수', 0),
                 }
             }
-            documents.append(doc)
-
+            for (sabon, emp), text in zip(self.employees.items(), texts)
+            for profile, financials in ((emp.employee_profile, emp.summary_financials),)
+        ]
+        for doc in documents:
+            doc['_pinecone_metadata'] = pinecone_metadata(doc)
         return documents
 
     def print_summary(self):
@@ -756,11 +1561,19 @@ class ExcelDataProcessor:
 
         print(f"\nTotal Employees: {len(self.employees)}")
 
-        total_commission = sum(len(emp.commission_contracts) for emp in self.employees.values())
-        total_override = sum(len(emp.override_records) for emp in self.employees.values())
-        total_policy = sum(len(emp.policy_contracts) for emp in self.employees.values())
-        total_performance = sum(len(emp.performance_records) for emp in self.employees.values())
-        total_clawback = sum(len(emp.clawback_records) for emp in self.employees.values())
+        # Every count and total in one pass over the employees
+        total_commission = total_override = total_policy = total_performance = total_clawback = 0
+        total_final_payment = total_commission_sum = total_override_sum = 0
+        for emp in self.employees.values():
+            total_commission += len(emp.commission_contracts)
+            total_override += len(emp.override_received)
+            total_policy += len(emp.policy_contracts)
+            total_performance += len(emp.performance_records)
+            total_clawback += len(emp.clawback_records)
+            financials = emp.summary_financials
+            total_final_payment += financials.get('최종지급액', 0)
+            total_commission_sum += financials.get('총_커미션', 0)
+            total_override_sum += financials.get('총_오버라이드', 0)
 
         print(f"\nTotal Records:")
         print(f"  - Commission Contracts: {total_commission:,}")
@@ -769,19 +1582,6 @@ class ExcelDataProcessor:
         print(f"  - Performance Records: {total_performance:,}")
         print(f"  - Clawback Records: {total_clawback:,}")
 
-        total_final_payment = sum(
-            emp.summary_financials.get('최종지급액', 0)
-            for emp in self.employees.values()
-        )
-        total_commission_sum = sum(
-            emp.summary_financials.get('총_커미션', 0)
-            for emp in self.employees.values()
-        )
-        total_override_sum = sum(
-            emp.summary_financials.get('총_오버라이드', 0)
-            for emp in self.employees.values()
-        )
-
         print(f"\nFinancial Summary:")
         print(f"  - Total Final Payments: {total_final_payment:,.0f} 원")
         print(f"  - Total Commissions: {total_commission_sum:,.0f} 원")
@@ -792,6 +1592,155 @@ class ExcelDataProcessor:
 # PART 3: PINECONE UPLOADER
 # =============================================================================
 
+# Texts shorter than this (e.g. a bare "사번: ..." line) carry nothing worth retrieving
+MIN_EMBED_TEXT_CHARS = 40
+
+# OpenAI limits for one embeddings request; the token budget keeps headroom below the 300K cap
+MAX_EMBED_REQUEST_INPUTS = 2048
+MAX_EMBED_REQUEST_TOKENS = 280_000
+MAX_EMBED_INPUT_TOKENS = 8191
+
+# Misses are sorted by token count within windows of this many consecutive texts, so each
+# employee's documents are embedded close together and can be upserted (and freed) early
+EMBED_SORT_WINDOW = 8 * MAX_EMBED_REQUEST_INPUTS
+
+# Below this many documents, per-process uploader setup costs more than sharding saves
+PARALLEL_UPLOAD_MIN_DOCUMENTS = 20000
+
+# Embedded employees waiting to be upserted; embedding pauses while the queue is full
+UPSERT_QUEUE_SIZE = 32
+
+# USD per 1K input tokens
+EMBEDDING_PRICES = {"text-embedding-3-large": 0.00013, "text-embedding-3-small": 0.00002}
+
+
+async def retry_with_backoff(call, max_retries: int = 6, base_delay: float = 1.0):
+    """Await `call()`, retrying rate limits and transient API errors with exponential backoff.
+
+    A 429 response's Retry-After header takes precedence over the computed delay.
+    """
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError) as e:
+            if attempt == max_retries:
+                raise
+            delay = base_delay * 2 ** attempt
+            response = getattr(e, 'response', None)
+            retry_after = response.headers.get('retry-after') if response is not None else None
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by SHA-256 of the embedded text.
+
+    Vectors are stored as float16 (half the size of float32) or, with
+    `quantization="int8"`, as int8 plus a per-vector scale (a quarter of the
+    size). Each row records its own scale, so both formats can share a file.
+    The model name and dimension are part of the key so switching either
+    never returns stale vectors.
+
+    With `fuzzy` enabled, a text that misses exactly can still hit an entry
+    whose text differs only in formatting (digit grouping, whitespace, line
+    order), via an alias table keyed by the normalized text.
+    """
+
+    _DIGIT_GROUPING = re.compile(r'(?<=\d),(?=\d{3})')
+    _WHITESPACE = re.compile(r'\s+')
+    _LOOKUP_CHUNK = 500  # keys per IN (...) query, below SQLite's bound-parameter limit
+
+    def __init__(self, path: str, model: str, dimension: int, fuzzy: bool = True, quantization: str = "float16"):
+        if quantization not in ("float16", "int8"):
+            raise ValueError(f"Unsupported cache quantization: {quantization}")
+        self.model = model
+        self.dimension = dimension
+        self.fuzzy = fuzzy
+        self.quantization = quantization
+        # The uploader embeds on a background thread, one thread at a time. Shard worker
+        # processes share the file, so writers wait out each other's locks
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # scale is NULL for float16 vectors and the dequantization factor for int8 vectors
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL, scale REAL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS aliases (norm_hash BLOB PRIMARY KEY, hash BLOB NOT NULL)")
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model}\0{self.dimension}\0{text}".encode('utf-8')).digest()
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Canonical form of `text` that ignores formatting-only differences"""
+        lines = (cls._WHITESPACE.sub(' ', cls._DIGIT_GROUPING.sub('', line)).strip() for line in text.splitlines())
+        return "\n".join(sorted(line for line in lines if line))
+
+    def _encode(self, vec: np.ndarray) -> Tuple[bytes, Optional[float]]:
+        if self.quantization == "float16":
+            return np.asarray(vec, dtype=np.float16).tobytes(), None
+        scale = float(np.abs(vec).max()) / 127 or 1.0
+        return np.round(np.asarray(vec) / scale).astype(np.int8).tobytes(), scale
+
+    @staticmethod
+    def _decode(blob: bytes, scale: Optional[float]) -> np.ndarray:
+        if scale is None:
+            return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
+    def _lookup(self, query: str, keys: List[bytes]) -> Dict[bytes, Tuple[bytes, Optional[float]]]:
+        """Run `query` (selecting key, vec, scale WHERE ... IN ({})) over `keys` in chunks"""
+        found = {}
+        for start in range(0, len(keys), self._LOOKUP_CHUNK):
+            chunk = keys[start:start + self._LOOKUP_CHUNK]
+            rows = self.conn.execute(query.format(",".join("?" * len(chunk))), chunk)
+            found.update((key, (vec, scale)) for key, vec, scale in rows)
+        return found
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Return the cached embedding of each text (None on a miss), with batched lookups"""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup("SELECT hash, vec, scale FROM embeddings WHERE hash IN ({})", keys)
+        rows = [found.get(key) for key in keys]
+
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing and self.fuzzy:
+            norm_keys = [self._key(self.normalize(texts[i])) for i in missing]
+            aliased = self._lookup(
+                "SELECT a.norm_hash, e.vec, e.scale FROM aliases a JOIN embeddings e ON e.hash = a.hash "
+                "WHERE a.norm_hash IN ({})",
+                norm_keys
+            )
+            for i, norm_key in zip(missing, norm_keys):
+                rows[i] = aliased.get(norm_key)
+
+        return [None if row is None else self._decode(*row) for row in rows]
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for `text`, or None on a miss"""
+        return self.get_many([text])[0]
+
+    def put_many(self, pairs: Iterable[Tuple[str, np.ndarray]]):
+        """Store (text, embedding) pairs in a single transaction"""
+        rows = [(text, self._key(text), *self._encode(vec)) for text, vec in pairs]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vec, scale) VALUES (?, ?, ?)",
+                ((key, vec, scale) for _, key, vec, scale in rows)
+            )
+            if self.fuzzy:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO aliases (norm_hash, hash) VALUES (?, ?)",
+                    ((self._key(self.normalize(text)), key) for text, key, _, _ in rows)
+                )
+
+
 class SecurePineconeUploader:
     """Secure uploader with namespace isolation"""
 
@@ -799,19 +1748,53 @@ class SecurePineconeUploader:
         self,
         index_name: str = "employee-compensation",
         embedding_model: str = "text-embedding-3-large",
-        dimension: int = 3072
+        dimension: int = 3072,
+        max_concurrent_requests: int = 35,
+        cache_path: Optional[str] = None,
+        fuzzy_cache: bool = True,
+        cache_quantization: str = "float16",
+        upsert_threads: int = 30
     ):
         self.validate_environment()
 
+        # gRPC is lighter than REST for large vector payloads; upserts are issued to match the client loaded here
+        try:
+            from pinecone.grpc import PineconeGRPC as Pinecone
+            self.use_grpc = True
+        except ImportError:
+            from pinecone import Pinecone
+            self.use_grpc = False
+
         self.pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-        self.openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        # Created per embedding run by embed_texts; its connections belong to that run's event loop
+        self.openai_client = None
 
         self.index_name = index_name
         self.embedding_model = embedding_model
         self.dimension = dimension
+        # In-flight embedding requests; ~35 suits OpenAI usage tier 1, ~125 tier 4
+        self.max_concurrent_requests = max_concurrent_requests
 
         self.setup_index()
-        self.index = self.pc.Index(self.index_name)
+        # Upserts in flight (see _upsert_ready). The REST index sizes its async_req thread pool from
+        # pool_threads; the gRPC index ignores it and runs upsert_async on its own executor
+        self.upsert_threads = upsert_threads
+        # Passing the described host saves the client a second describe_index call
+        self.index = self.pc.Index(self.index_name, host=self.index_description.host, pool_threads=upsert_threads)
+        logger.info("   Upserts: %s", "gRPC" if self.use_grpc else "REST (install pinecone[grpc] for gRPC)")
+
+        self.cache_options = dict(cache_path=cache_path, fuzzy_cache=fuzzy_cache, cache_quantization=cache_quantization)
+        self.tokenizer = self.load_tokenizer(self.embedding_model)
+        self.tokens_embedded = 0  # tokens sent to OpenAI in successful requests
+
+    @functools.cached_property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache, opened on first use so that setting up an uploader creates no files"""
+        options = self.cache_options
+        if not options['cache_path']:
+            return None
+        return EmbeddingCache(options['cache_path'], self.embedding_model, self.dimension,
+                              fuzzy=options['fuzzy_cache'], quantization=options['cache_quantization'])
 
     def validate_environment(self):
         """Validate required environment variables"""
@@ -819,74 +1802,297 @@ class SecurePineconeUploader:
         missing = [var for var in required if not os.environ.get(var)]
 
         if missing:
-            print("❌ Missing required environment variables:")
+            logger.error("❌ Missing required environment variables:")
             for var in missing:
-                print(f"   - {var}")
-            print("\nSet them using:")
-            print("   export PINECONE_API_KEY='your-key'")
-            print("   export OPENAI_API_KEY='your-key'")
+                logger.error("   - %s", var)
+            logger.error("\nSet them using:")
+            logger.error("   export PINECONE_API_KEY='your-key'")
+            logger.error("   export OPENAI_API_KEY='your-key'")
             sys.exit(1)
 
     def setup_index(self):
-        """Verify index exists and get its specs"""
+        """Verify index exists and get its specs (kept as self.index_description)"""
+        from pinecone.exceptions import NotFoundException
+
         try:
-            indexes = list(self.pc.list_indexes())
-            existing_index = next((idx for idx in indexes if idx.name == self.index_name), None)
+            # One targeted call; the full index list is only fetched to report a missing index
+            try:
+                existing_index = self.pc.describe_index(self.index_name)
+            except NotFoundException:
+                existing_index = None
 
             if existing_index:
-                print(f"✅ Using existing index: {self.index_name}")
-                print(f"   Dimension: {existing_index.dimension}")
-                print(f"   Metric: {existing_index.metric}")
+                self.index_description = existing_index
+                logger.info("✅ Using existing index: %s", self.index_name)
+                logger.info("   Dimension: %s", existing_index.dimension)
+                logger.info("   Metric: %s", existing_index.metric)
 
                 if existing_index.dimension != self.dimension:
-                    print(f"\n⚠️  Warning: Index dimension ({existing_index.dimension}) differs from embedding model ({self.dimension})")
-                    print(f"   Updating to use index dimension: {existing_index.dimension}")
+                    logger.warning("\n⚠️  Warning: Index dimension (%s) differs from embedding model (%s)",
+                                   existing_index.dimension, self.dimension)
+                    logger.warning("   Updating to use index dimension: %s", existing_index.dimension)
                     self.dimension = existing_index.dimension
-
-                    if self.dimension == 1536:
-                        print(f"   Switching to text-embedding-3-small (1536 dimensions)")
-                        self.embedding_model = "text-embedding-3-small"
+                    if not self.embedding_model.startswith("text-embedding-3"):
+                        logger.warning("   ⚠️  %s cannot shorten its vectors; upserts will fail", self.embedding_model)
             else:
-                print(f"❌ Index '{self.index_name}' not found")
-                print(f"\nAvailable indexes:")
-                for idx in indexes:
-                    print(f"   - {idx.name} (dimension: {idx.dimension})")
+                logger.error("❌ Index '%s' not found", self.index_name)
+                logger.error("\nAvailable indexes:")
+                for idx in self.pc.list_indexes():
+                    logger.error("   - %s (dimension: %s)", idx.name, idx.dimension)
                 raise ValueError(f"Index '{self.index_name}' does not exist")
 
         except Exception as e:
-            print(f"❌ Error checking index: {e}")
+            logger.error("❌ Error checking index: %s", e)
             raise
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings in batch"""
-        if len(texts) > 2048:
-            raise ValueError("OpenAI supports max 2048 texts per batch")
+    async def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings in batch, as an (n, dimension) float32 array.
+
+        Vectors are requested base64-encoded so they arrive as raw float32
+        bytes instead of thousands of JSON numbers each.
+        """
+        if len(texts) > MAX_EMBED_REQUEST_INPUTS:
+            raise ValueError(f"OpenAI supports max {MAX_EMBED_REQUEST_INPUTS} texts per batch")
 
-        response = self.openai_client.embeddings.create(
+        # text-embedding-3 models shorten vectors server-side to the index dimension
+        dimensions = {"dimensions": self.dimension} if self.embedding_model.startswith("text-embedding-3") else {}
+        response = await self.openai_client.embeddings.create(
             model=self.embedding_model,
             input=texts,
-            encoding_format="float"
+            encoding_format="base64",
+            **dimensions
         )
 
-        return [item.embedding for item in response.data]
+        return np.stack([np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32) for item in response.data])
+
+    @staticmethod
+    def load_tokenizer(model: str):
+        """tiktoken encoding of `model`, or None when token counts have to be estimated"""
+        try:
+            import tiktoken
+        except ImportError:
+            logger.warning("⚠️  tiktoken not installed, estimating token counts")
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except Exception as e:  # unknown model, or the encoding file can't be downloaded
+            logger.warning("⚠️  Could not load tokenizer for %s (%s), estimating token counts", model, e.__class__.__name__)
+            return None
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token count of each text; exact with tiktoken (encoded in parallel), else estimate_tokens"""
+        if self.tokenizer is None:
+            return [self.estimate_tokens(text) for text in texts]
+        return [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(texts, num_threads=8)]
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Cheap upper estimate of a text's token count.
+
+        Half its UTF-8 length: 1.5 tokens per Hangul syllable and 0.5 per
+        ASCII character, both above what the embedding tokenizer produces.
+        """
+        return len(text.encode('utf-8')) // 2 + 1
+
+    @staticmethod
+    def pack_requests(rows: List[int], token_counts: List[int]) -> List[List[int]]:
+        """Split `rows` (in order; `token_counts` aligned with them) into requests within the input and token limits"""
+        requests: List[List[int]] = []
+        request: List[int] = []
+        request_tokens = 0
+        for row, tokens in zip(rows, token_counts):
+            if request and (len(request) == MAX_EMBED_REQUEST_INPUTS or request_tokens + tokens > MAX_EMBED_REQUEST_TOKENS):
+                requests.append(request)
+                request, request_tokens = [], 0
+            request.append(row)
+            request_tokens += tokens
+        if request:
+            requests.append(request)
+        return requests
+
+    def _new_openai_client(self):
+        """A fresh AsyncOpenAI client for the current event loop.
+
+        Its connection pool (the SDK's defaults, well above
+        max_concurrent_requests) is shared by every request of the run, over
+        HTTP/2 when h2 is installed, and is closed with the client at the end
+        of the run.
+        """
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        http_client = DefaultAsyncHttpxClient(http2=importlib.util.find_spec("h2") is not None)
+        # Retries are handled by retry_with_backoff so Retry-After is honored
+        return AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], max_retries=0, http_client=http_client)
+
+    async def embed_texts(
+        self,
+        texts: List[str],
+        on_embedded: Optional[Callable[[List[int], np.ndarray], Awaitable[None]]] = None
+    ) -> Optional[np.ndarray]:
+        """Run embed_all with an OpenAI client created for, and closed with, the running event loop.
+
+        Each asyncio.run() starts a new loop, and an async client's pooled
+        connections can't be used from a later one ("Event loop is closed"),
+        so the uploader never keeps a client between runs.
+        """
+        self.openai_client = self._new_openai_client()
+        try:
+            return await self.embed_all(texts, on_embedded)
+        finally:
+            await self.openai_client.close()
+            self.openai_client = None
+
+    async def embed_all(
+        self,
+        texts: List[str],
+        on_embedded: Optional[Callable[[List[int], np.ndarray], Awaitable[None]]] = None
+    ) -> Optional[np.ndarray]:
+        """Embed all texts with concurrent requests, packed up to the OpenAI input and token limits.
+
+        Repeated texts are embedded once, and texts found in the embedding
+        cache are not sent to OpenAI. The rest are sorted by token count
+        (within windows of EMBED_SORT_WINDOW texts) before being split into
+        requests so that each request carries texts of similar size. Rows of
+        a request that still fails after retries are NaN; a request OpenAI
+        rejects as invalid is split until only the offending input is NaN.
+
+        `await on_embedded(rows, vectors)` receives each group of rows as soon
+        as it is final (cache hits block by block, then each request as it
+        completes) and owns the vectors from then on; nothing is kept here and
+        None is returned. Requests hold their concurrency slot until the
+        callback returns, so a slow consumer holds back further requests.
+        Without a callback, returns an (N, dimension) array in input order.
+        """
+        if on_embedded is None:
+            embeddings = np.full((len(texts), self.dimension), np.nan, dtype=np.float32)
+
+            async def collect(rows: List[int], vectors: np.ndarray):
+                embeddings[rows] = vectors
+
+            await self.embed_all(texts, collect)
+            return embeddings
+
+        # Identical texts (e.g. employees with the same all-zero month) are embedded once
+        unique_index: Dict[str, int] = {}
+        inverse = [unique_index.setdefault(text, len(unique_index)) for text in texts]
+        if len(unique_index) < len(texts):
+            logger.info("   Deduplicated %d repeated texts", len(texts) - len(unique_index))
+            copies: List[List[int]] = [[] for _ in unique_index]
+            for row, unique_row in enumerate(inverse):
+                copies[unique_row].append(row)
+
+            async def on_unique_embedded(rows: List[int], vectors: np.ndarray):
+                groups = [copies[row] for row in rows]
+                await on_embedded([row for group in groups for row in group],
+                                  np.repeat(vectors, [len(group) for group in groups], axis=0))
+
+            await self.embed_all(list(unique_index), on_unique_embedded)
+            return None
+
+        misses = []
+        if self.embedding_cache:
+            for start in range(0, len(texts), MAX_EMBED_REQUEST_INPUTS):
+                block = texts[start:start + MAX_EMBED_REQUEST_INPUTS]
+                # The cache only saves requests; it never fails the upload
+                try:
+                    cached_embeddings = self.embedding_cache.get_many(block)
+                except sqlite3.Error as e:
+                    logger.warning("⚠️  Embedding cache lookup failed, embedding %d texts: %s", len(block), e)
+                    cached_embeddings = [None] * len(block)
+                hits = []
+                for row, cached in enumerate(cached_embeddings, start):
+                    if cached is not None and cached.shape == (self.dimension,):
+                        hits.append(row)
+                    else:
+                        misses.append(row)
+                if hits:
+                    await on_embedded(hits, np.stack([cached_embeddings[row - start] for row in hits]))
+            logger.info("   Embedding cache: %d hits, %d misses", len(texts) - len(misses), len(misses))
+        else:
+            misses = list(range(len(texts)))
+
+        token_counts = dict(zip(misses, self.count_tokens([texts[row] for row in misses])))
+        # OpenAI rejects a whole request over one input above the model's limit. Estimated counts
+        # overstate, so without tiktoken such inputs are left to embed_rows to isolate instead
+        if self.tokenizer is not None:
+            oversize = [row for row in misses if token_counts[row] > MAX_EMBED_INPUT_TOKENS]
+            if oversize:
+                logger.error("❌ Skipping %d texts over the %d-token input limit", len(oversize), MAX_EMBED_INPUT_TOKENS)
+                misses = [row for row in misses if token_counts[row] <= MAX_EMBED_INPUT_TOKENS]
+                await on_embedded(oversize, np.full((len(oversize), self.dimension), np.nan, dtype=np.float32))
+
+        # Longest first by token count, so each request carries similar-length texts
+        chunks = []
+        for start in range(0, len(misses), EMBED_SORT_WINDOW):
+            window = sorted(misses[start:start + EMBED_SORT_WINDOW], key=token_counts.__getitem__, reverse=True)
+            chunks.extend(self.pack_requests(window, [token_counts[row] for row in window]))
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        from openai import BadRequestError
+
+        async def embed_rows(rows: List[int]) -> np.ndarray:
+            chunk = [texts[row] for row in rows]
+            try:
+                vectors = await retry_with_backoff(lambda: self.generate_embeddings_batch(chunk))
+            except BadRequestError as e:
+                if len(rows) > 1:
+                    # One invalid input fails the whole request; halve it until that input is isolated
+                    half = len(rows) // 2
+                    return np.concatenate([await embed_rows(rows[:half]), await embed_rows(rows[half:])])
+                logger.error("❌ Error generating embeddings for 1 text: %s", e)
+                return np.full((1, self.dimension), np.nan, dtype=np.float32)
+            except Exception as e:
+                logger.error("❌ Error generating embeddings for %d texts: %s", len(rows), e)
+                return np.full((len(rows), self.dimension), np.nan, dtype=np.float32)
+
+            # Only the event loop thread updates this, so no lock is needed
+            self.tokens_embedded += sum(token_counts[row] for row in rows)
+            if self.embedding_cache:
+                try:
+                    self.embedding_cache.put_many(zip(chunk, vectors))
+                except sqlite3.Error as e:
+                    logger.warning("⚠️  Could not cache %d embeddings: %s", len(rows), e)
+            return vectors
+
+        async def embed_chunk(rows: List[int]):
+            async with semaphore:
+                await on_embedded(rows, await embed_rows(rows))
+
+        await asyncio.gather(*(embed_chunk(rows) for rows in chunks))
+        return None
 
     def upload_documents(
         self,
         documents: List[Dict[Any, Any]],
-        batch_size: int = 100
+        batch_size: int = 100,
+        processes: int = 1
     ):
-        """Securely upload documents with namespace isolation"""
+        """Securely upload documents with namespace isolation.
+
+        Embedding and upserting are pipelined: a background thread embeds
+        every document with overlapping OpenAI requests (see embed_all) and
+        queues each employee with their vectors as soon as all of their
+        documents are embedded, while this thread upserts queued employees
+        with up to 2 * upsert_threads requests in flight. The queue is
+        bounded, so memory stays proportional to the work in flight.
+
+        With `processes` > 1, large runs are split by employee into that many
+        shards, each uploaded by its own process with its own clients and a
+        share of the request limits.
+        """
         print("\n" + "="*80)
         print("STEP 2: SECURE PINECONE UPLOAD")
         print("="*80)
 
-        # Group documents by employee
-        docs_by_employee = {}
-        for doc in documents:
-            sabon = doc['metadata']['사번']
-            if sabon not in docs_by_employee:
-                docs_by_employee[sabon] = []
-            docs_by_employee[sabon].append(doc)
+        # Don't pay to embed near-empty documents
+        short_count = sum(len(doc['text']) < MIN_EMBED_TEXT_CHARS for doc in documents)
+        if short_count:
+            print(f"\n⏭️  Skipping {short_count} documents shorter than {MIN_EMBED_TEXT_CHARS} characters")
+            documents = [doc for doc in documents if len(doc['text']) >= MIN_EMBED_TEXT_CHARS]
+        if not documents:
+            print("\n✅ Nothing to upload")
+            return
+
+        row_sabons, docs_by_employee = self._group_rows(documents)
 
         print(f"\n📊 Upload Statistics:")
         print(f"   Total employees: {len(docs_by_employee)}")
@@ -897,68 +2103,227 @@ class SecurePineconeUploader:
         print(f"   Embedding dimension: {self.dimension}")
         print(f"\n🔐 Security: Namespace isolation per employee")
 
-        total_uploaded = 0
-        total_cost = 0.0
+        tokens_before = self.tokens_embedded
+        failures: List[str] = []  # one line per batch that was not uploaded, summarized at the end
 
-        for idx, (sabon, employee_docs) in enumerate(tqdm(docs_by_employee.items(), desc="Uploading employees"), 1):
-            namespace = f"employee_{sabon}"
-            사원명 = employee_docs[0]['metadata'].get('사원명', 'Unknown')
+        if processes > 1 and len(documents) >= PARALLEL_UPLOAD_MIN_DOCUMENTS:
+            print(f"\n🔢 Embedding and uploading {len(documents)} documents in {processes} processes...")
+            total_uploaded, tokens_sent = self._upload_sharded(documents, docs_by_employee, batch_size, processes, failures)
+        else:
+            print(f"\n🔢 Embedding {len(documents)} documents (up to {self.max_concurrent_requests} concurrent requests)...")
+            total_uploaded = self._upload_rows(documents, row_sabons, docs_by_employee, batch_size, failures)
+            tokens_sent = self.tokens_embedded - tokens_before
 
-            # Process in batches
-            for batch_idx in range(0, len(employee_docs), batch_size):
-                batch = employee_docs[batch_idx:batch_idx + batch_size]
+        print("\n" + "="*80)
+        print("📊 UPLOAD COMPLETE")
+        print("="*80)
+        print(f"\n✅ Successfully uploaded: {total_uploaded} vectors")
+        total_cost = tokens_sent / 1000 * EMBEDDING_PRICES.get(self.embedding_model, 0.00013)
+        print(f"💰 Estimated embedding cost: ${total_cost:.4f} ({tokens_sent:,} tokens sent)")
+        if failures:
+            print(f"\n❌ {len(failures)} batches were not uploaded:")
+            for failure in failures[:20]:
+                print(f"   - {failure}")
+            if len(failures) > 20:
+                print(f"   ... and {len(failures) - 20} more")
+
+        self.verify_upload()
 
-                texts = [doc['text'] for doc in batch]
+    @staticmethod
+    def _group_rows(documents: List[Dict[Any, Any]]) -> Tuple[List[Any], Dict[Any, List[int]]]:
+        """Each document's sabon, and the document rows of each employee"""
+        row_sabons = [doc['metadata']['사번'] for doc in documents]
+        docs_by_employee: Dict[Any, List[int]] = defaultdict(list)
+        for row, sabon in enumerate(row_sabons):
+            docs_by_employee[sabon].append(row)
+        return row_sabons, docs_by_employee
 
-                total_chars = sum(len(text) for text in texts)
-                estimated_tokens = total_chars / 4
-                estimated_cost = (estimated_tokens / 1000) * 0.00013
+    def _upload_sharded(
+        self,
+        documents: List[Dict[Any, Any]],
+        docs_by_employee: Dict[Any, List[int]],
+        batch_size: int,
+        processes: int,
+        failures: List[str]
+    ) -> Tuple[int, int]:
+        """Upload employee shards in worker processes; return (vectors uploaded, tokens sent)"""
+        import multiprocessing as mp
+
+        # Round-robin by employee, so each employee's namespace is written by one process only.
+        # An employee whose first document repeats an earlier text joins that text's shard, where
+        # embed_all's in-run dedup can still embed it once
+        shards: List[List[Dict[Any, Any]]] = [[] for _ in range(processes)]
+        text_shards: Dict[str, int] = {}
+        for i, rows in enumerate(docs_by_employee.values()):
+            shard = text_shards.setdefault(documents[rows[0]]['text'], i % processes)
+            shards[shard].extend(documents[row] for row in rows)
+        shards = [shard for shard in shards if shard]
+
+        # Workers share this uploader's request limits; each repeats the index setup, quietly
+        uploader_kwargs = dict(
+            index_name=self.index_name,
+            embedding_model=self.embedding_model,
+            dimension=self.dimension,
+            max_concurrent_requests=max(1, self.max_concurrent_requests // processes),
+            upsert_threads=max(1, self.upsert_threads // processes),
+            **self.cache_options
+        )
 
+        total_uploaded = tokens_sent = 0
+        # Spawned, not forked: this process runs threads (and their locks) that a fork would copy mid-use
+        with mp.get_context("spawn").Pool(processes, initializer=_init_shard_uploader, initargs=(uploader_kwargs,)) as pool:
+            shard_results = pool.imap_unordered(_upload_shard, ((shard, batch_size) for shard in shards))
+            for uploaded, tokens, shard_failures in tqdm(shard_results, total=len(shards), desc="Uploading shards"):
+                total_uploaded += uploaded
+                tokens_sent += tokens
+                failures.extend(shard_failures)
+        return total_uploaded, tokens_sent
+
+    def _upload_rows(
+        self,
+        documents: List[Dict[Any, Any]],
+        row_sabons: List[Any],
+        docs_by_employee: Dict[Any, List[int]],
+        batch_size: int,
+        failures: List[str],
+        progress: bool = True
+    ) -> int:
+        """Embed and upsert `documents` (grouped by _group_rows) in this process; return the vectors uploaded"""
+        # Embed on a background thread; only employees with rows still being embedded are held
+        # here, and each is queued with its vectors once all their rows are final
+        positions = {row: i for rows in docs_by_employee.values() for i, row in enumerate(rows)}
+        remaining = {sabon: len(rows) for sabon, rows in docs_by_employee.items()}
+        partial: Dict[Any, np.ndarray] = {}
+        ready: queue.Queue = queue.Queue(maxsize=UPSERT_QUEUE_SIZE)  # (sabon, vectors), then None
+        stopped = threading.Event()  # set when the upsert stage fails, so nothing waits on it
+
+        def put_ready(item) -> bool:
+            while not stopped.is_set():
                 try:
-                    embeddings = self.generate_embeddings_batch(texts)
-                    total_cost += estimated_cost
-                except Exception as e:
-                    print(f"\n❌ Error generating embeddings for {사원명}: {e}")
+                    ready.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        async def on_embedded(rows: List[int], vectors: np.ndarray):
+            completed = []
+            for row, vector in zip(rows, vectors):
+                sabon = row_sabons[row]
+                if sabon not in partial:
+                    partial[sabon] = np.empty((len(docs_by_employee[sabon]), self.dimension), dtype=np.float32)
+                partial[sabon][positions[row]] = vector
+                remaining[sabon] -= 1
+                if not remaining[sabon]:
+                    completed.append((sabon, partial.pop(sabon)))
+            for item in completed:
+                # Blocks (off the event loop) while the upsert stage is behind
+                if not await asyncio.to_thread(put_ready, item):
+                    raise RuntimeError("Upsert stage stopped")
+
+        def embed_stage():
+            try:
+                asyncio.run(self.embed_texts([doc['text'] for doc in documents], on_embedded))
+            finally:
+                put_ready(None)
+
+        embed_pool = ThreadPoolExecutor(1)
+        embed_future = embed_pool.submit(embed_stage)
+        embed_pool.shutdown(wait=False)
+
+        with logging_redirect_tqdm():
+            try:
+                total_uploaded = self._upsert_ready(documents, docs_by_employee, ready, batch_size, failures, progress)
+            except BaseException:
+                stopped.set()
+                raise
+            embed_future.result()  # re-raise anything that stopped the embedding stage
+        return total_uploaded
+
+    def _upsert_ready(
+        self,
+        documents: List[Dict[Any, Any]],
+        docs_by_employee: Dict[Any, List[int]],
+        ready: queue.Queue,
+        batch_size: int,
+        failures: List[str],
+        progress: bool = True
+    ) -> int:
+        """Upsert each (sabon, vectors) taken from `ready` until its None sentinel; return the vectors uploaded"""
+        total_uploaded = 0
+        # In-flight upserts as (사원명, vector count, async result); bounded to cap memory
+        pending = deque()
+
+        for sabon, employee_embeddings in tqdm(
+            iter(ready.get, None), total=len(docs_by_employee), desc="Uploading employees", disable=not progress
+        ):
+            employee_rows = docs_by_employee[sabon]
+            namespace = f"employee_{sabon}"
+            사원명 = documents[employee_rows[0]]['metadata'].get('사원명', 'Unknown')
+
+            # Process in batches
+            for batch_idx in range(0, len(employee_rows), batch_size):
+                batch_rows = employee_rows[batch_idx:batch_idx + batch_size]
+                embeddings = employee_embeddings[batch_idx:batch_idx + batch_size]
+
+                if np.isnan(embeddings).any():
+                    logger.error("❌ Skipping %s: embeddings unavailable", 사원명)
+                    failures.append(f"{사원명} ({sabon}): embeddings unavailable")
                     continue
 
-                vectors = []
-                for doc, embedding in zip(batch, embeddings):
-                    doc_sabon = doc['metadata']['사번']
-                    if doc_sabon != sabon:
-                        raise ValueError(
-                            f"🚨 Security Error: Document 사번 ({doc_sabon}) "
-                            f"doesn't match employee ({sabon})"
-                        )
+                batch = [documents[row] for row in batch_rows]
 
-                    vector = {
-                        'id': doc['id'],
-                        'values': embedding,
-                        'metadata': {
-                            '사번': doc['metadata']['사번'],
-                            '사원명': doc['metadata']['사원명'],
-                            'doc_type': doc['doc_type'],
-                            **{k: v for k, v in doc['metadata'].items()
-                               if k not in ['사번', '사원명', 'doc_type'] and v is not None}
-                        }
-                    }
-                    vectors.append(vector)
+                # One check per batch; raised even under python -O, unlike assert
+                batch_sabons = {doc['metadata']['사번'] for doc in batch}
+                if batch_sabons != {sabon}:
+                    raise ValueError(
+                        f"🚨 Security Error: Document 사번 ({', '.join(map(str, batch_sabons - {sabon}))}) "
+                        f"doesn't match employee ({sabon})"
+                    )
 
                 try:
-                    self.index.upsert(
-                        vectors=vectors,
-                        namespace=namespace
-                    )
-                    total_uploaded += len(vectors)
+                    pending.append((사원명, len(batch), self._start_upsert(self._make_vectors(batch, embeddings), namespace)))
+                except TypeError:
+                    raise  # a call the client doesn't support fails every batch, not just this employee's
                 except Exception as e:
-                    print(f"\n❌ Error uploading for {사원명}: {e}")
-
-        print("\n" + "="*80)
-        print("📊 UPLOAD COMPLETE")
-        print("="*80)
-        print(f"\n✅ Successfully uploaded: {total_uploaded} vectors")
-        print(f"💰 Estimated embedding cost: ${total_cost:.4f}")
+                    logger.error("❌ Error uploading for %s: %s", 사원명, e)
+                    failures.append(f"{사원명} ({sabon}): {e}")
+
+                if len(pending) >= 2 * self.upsert_threads:
+                    total_uploaded += self._wait_for_upsert(*pending.popleft(), failures)
+
+        while pending:
+            total_uploaded += self._wait_for_upsert(*pending.popleft(), failures)
+        return total_uploaded
+
+    def _start_upsert(self, vectors: Iterable[Dict[str, Any]], namespace: str):
+        """Start an upsert without waiting; returns a Future (gRPC) or ApplyResult (REST) for _wait_for_upsert"""
+        if self.use_grpc:
+            return self.index.upsert_async(vectors=vectors, namespace=namespace)
+        return self.index.upsert(vectors=vectors, namespace=namespace, async_req=True)
+
+    @staticmethod
+    def _make_vectors(batch: List[Dict[str, Any]], embeddings: np.ndarray) -> Iterable[Dict[str, Any]]:
+        """Yield the upsert payload of each document, converting its vector to floats only when consumed"""
+        for doc, embedding in zip(batch, embeddings):
+            metadata = doc.get('_pinecone_metadata')
+            yield {
+                'id': doc['id'],
+                'values': embedding.tolist(),
+                'metadata': metadata if metadata is not None else pinecone_metadata(doc)
+            }
 
-        self.verify_upload()
+    @staticmethod
+    def _wait_for_upsert(사원명: str, count: int, result, failures: List[str]) -> int:
+        """Wait for an async upsert; return the number of vectors it uploaded (0 and a `failures` entry on error)"""
+        try:
+            # gRPC upserts return a Future, REST upserts an ApplyResult
+            result.result() if isinstance(result, Future) else result.get()
+            return count
+        except Exception as e:
+            logger.error("❌ Error uploading for %s: %s", 사원명, e)
+            failures.append(f"{사원명}: {e}")
+            return 0
 
     def verify_upload(self):
         """Verify upload with index statistics"""
@@ -978,6 +2343,32 @@ class SecurePineconeUploader:
             print(f"\n⚠️  Could not verify upload: {e}")
 
 
+# Per-process uploader of upload_documents(processes=...) workers
+_shard_uploader: Optional[SecurePineconeUploader] = None
+
+
+def _init_shard_uploader(uploader_kwargs: Dict[str, Any]):
+    global _shard_uploader
+    # The parent process already reported the index setup; errors still show
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        _shard_uploader = SecurePineconeUploader(**uploader_kwargs)
+    finally:
+        logger.setLevel(level)
+
+
+def _upload_shard(args: Tuple[List[Dict[Any, Any]], int]) -> Tuple[int, int, List[str]]:
+    """Upload one shard of documents; return (vectors uploaded, tokens sent, failures)"""
+    documents, batch_size = args
+    uploader = _shard_uploader
+    tokens_before = uploader.tokens_embedded
+    failures: List[str] = []
+    row_sabons, docs_by_employee = uploader._group_rows(documents)
+    uploaded = uploader._upload_rows(documents, row_sabons, docs_by_employee, batch_size, failures, progress=False)
+    return uploaded, uploader.tokens_embedded - tokens_before, failures
+
+
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
@@ -987,8 +2378,14 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='Combined Excel to Pinecone Pipeline')
     parser.add_argument('-y', '--yes', action='store_true', help='Skip confirmation prompt')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only report warnings while processing the Excel file')
+    parser.add_argument('--sheet-cache', action='store_true',
+                        help='Reuse parsed sheets between runs (kept owner-only under ~/.cache; holds personal data)')
     args = parser.parse_args()
 
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(logging.WARNING if args.quiet else logging.INFO)
+
     print("="*80)
     print("COMBINED EXCEL TO PINECONE PIPELINE")
     print("="*80)
@@ -999,6 +2396,16 @@ def main():
     EMBEDDING_MODEL = "text-embedding-3-large"
     DIMENSION = 3072
     BATCH_SIZE = 100
+    MAX_CONCURRENT_REQUESTS = 35  # OpenAI usage tier 1; raise to ~125 on tier 4
+    EMBEDDING_CACHE_PATH = "embedding_cache.sqlite"
+    # Parsed sheets, reused while the workbook is unchanged (opt-in with --sheet-cache). They hold personal
+    # data, so they live in a per-user cache directory rather than next to the shared workbook
+    SHEET_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "combined_excel_to_pinecone"
+    SHEET_CACHE_PATH = str(SHEET_CACHE_DIR / f"{hashlib.sha256(os.path.abspath(EXCEL_PATH).encode()).hexdigest()[:16]}.sheets.pkl")
+    FUZZY_CACHE = True  # reuse cached vectors for texts differing only in formatting
+    CACHE_QUANTIZATION = "float16"  # or "int8" for a 4x smaller cache file
+    UPSERT_THREADS = 30  # concurrent Pinecone upsert requests
+    UPLOAD_PROCESSES = os.cpu_count() or 1  # used for runs of PARALLEL_UPLOAD_MIN_DOCUMENTS or more
     SKIP_CONFIRM = args.yes
 
     # Check if Excel file exists
@@ -1010,9 +2417,26 @@ def main():
     print(f"🎯 Target index: {INDEX_NAME}")
     print(f"🔢 Embedding model: {EMBEDDING_MODEL}")
 
+    # Connect to Pinecone and check the index on a worker thread while the Excel file is processed.
+    # Its output goes through the logger, so it can't split the processing report's lines; it writes
+    # nothing locally (the embedding cache is opened by the first upload)
+    uploader_pool = ThreadPoolExecutor(1)
+    uploader_future = uploader_pool.submit(
+        SecurePineconeUploader,
+        index_name=INDEX_NAME,
+        embedding_model=EMBEDDING_MODEL,
+        dimension=DIMENSION,
+        max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
+        cache_path=EMBEDDING_CACHE_PATH,
+        fuzzy_cache=FUZZY_CACHE,
+        cache_quantization=CACHE_QUANTIZATION,
+        upsert_threads=UPSERT_THREADS
+    )
+    uploader_pool.shutdown(wait=False)
+
     # Step 1: Process Excel
     print("\n" + "="*80)
-    processor = ExcelDataProcessor(EXCEL_PATH)
+    processor = ExcelDataProcessor(EXCEL_PATH, sheet_cache_path=SHEET_CACHE_PATH if args.sheet_cache else None)
     employees = processor.process_all()
     processor.print_summary()
 
@@ -1031,21 +2455,19 @@ def main():
     if not SKIP_CONFIRM:
         response = input("\n   Proceed with upload? (yes/no): ")
         if response.lower() not in ['yes', 'y']:
+            uploader_future.cancel()  # a setup already under way only finishes its describe_index
             print("\n❌ Upload cancelled")
             sys.exit(0)
     else:
         print("\n   Auto-confirmed with --yes flag")
 
-    # Initialize uploader and upload
-    uploader = SecurePineconeUploader(
-        index_name=INDEX_NAME,
-        embedding_model=EMBEDDING_MODEL,
-        dimension=DIMENSION
-    )
+    # Wait for the uploader (re-raises any setup error, e.g. a missing index) and upload
+    uploader = uploader_future.result()
 
     uploader.upload_documents(
         documents=documents,
-        batch_size=BATCH_SIZE
+        batch_size=BATCH_SIZE,
+        processes=UPLOAD_PROCESSES
     )
 
     print("\n" + "="*80)
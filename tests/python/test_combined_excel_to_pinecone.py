@@ -0,0 +1,118 @@
+"""Tests for combined_excel_to_pinecone.py
+
+Run from the repository root with:
+    python -m unittest discover tests/python
+"""
+import asyncio
+import importlib.util
+import os
+import queue
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+SCRIPT = Path(__file__).resolve().parents[2] / "combined_excel_to_pinecone.py"
+_spec = importlib.util.spec_from_file_location("combined_excel_to_pinecone", SCRIPT)
+pipeline = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = pipeline  # dataclasses resolve their module by name
+_spec.loader.exec_module(pipeline)
+
+DIMENSION = 4
+
+
+def _uploader(**attrs) -> "pipeline.SecurePineconeUploader":
+    """An uploader with only the attributes a test needs (no API keys or network)"""
+    uploader = pipeline.SecurePineconeUploader.__new__(pipeline.SecurePineconeUploader)
+    uploader.dimension = DIMENSION
+    uploader.__dict__.update(attrs)
+    return uploader
+
+
+@unittest.skipUnless(importlib.util.find_spec("pinecone"), "pinecone is not installed")
+class UpsertReadyClientTest(unittest.TestCase):
+    """_upsert_ready issues upserts each real Pinecone index client accepts"""
+
+    documents = [
+        {'id': f'{sabon}-{i}', 'doc_type': 'monthly', 'text': f'{sabon} {i}',
+         'metadata': {'사번': sabon, '사원명': f'name {sabon}'}}
+        for sabon in ('A001', 'B002') for i in range(3)
+    ]
+
+    def upsert_ready(self, uploader):
+        _, docs_by_employee = uploader._group_rows(self.documents)
+        ready = queue.Queue()
+        for sabon, rows in docs_by_employee.items():
+            ready.put((sabon, np.ones((len(rows), DIMENSION), dtype=np.float32)))
+        ready.put(None)
+        failures = []
+        uploaded = uploader._upsert_ready(self.documents, docs_by_employee, ready, 2, failures, progress=False)
+        return uploaded, failures
+
+    def test_grpc_index(self):
+        from pinecone.grpc import PineconeGRPC
+
+        sent = []
+
+        class Channel:
+            def upsert(self, vectors, namespace, timeout_s=None):
+                sent.append((namespace, len(vectors)))
+                return {"upserted_count": len(vectors)}
+
+            def close(self):
+                pass
+
+        index = PineconeGRPC(api_key="test").Index(host="test-index.svc.pinecone.io")
+        index._channel = Channel()
+        self.addCleanup(index.close)
+        uploaded, failures = self.upsert_ready(_uploader(index=index, use_grpc=True, upsert_threads=2))
+
+        self.assertEqual(failures, [])
+        self.assertEqual(uploaded, 6)
+        self.assertEqual(sorted(sent), [('employee_A001', 1), ('employee_A001', 2),
+                                        ('employee_B002', 1), ('employee_B002', 2)])
+
+    def test_rest_index(self):
+        from pinecone import Pinecone
+
+        sent = []
+
+        def upsert_one_batch(*, vectors, namespace, timeout):
+            vectors = list(vectors)
+            sent.append((namespace, len(vectors)))
+            return {"upserted_count": len(vectors)}
+
+        index = Pinecone(api_key="test").Index(host="https://test-index.svc.pinecone.io", pool_threads=2)
+        index._upsert_one_batch = upsert_one_batch
+        self.addCleanup(index.close)  # also shuts down its async_req thread pool
+        uploaded, failures = self.upsert_ready(_uploader(index=index, use_grpc=False, upsert_threads=2))
+
+        self.assertEqual(failures, [])
+        self.assertEqual(uploaded, 6)
+        self.assertEqual(sorted(sent), [('employee_A001', 1), ('employee_A001', 2),
+                                        ('employee_B002', 1), ('employee_B002', 2)])
+
+
+@unittest.skipUnless(importlib.util.find_spec("openai"), "openai is not installed")
+class OpenAIClientTest(unittest.TestCase):
+    """Each embedding run's OpenAI client can be built and closed with the installed SDK"""
+
+    def test_new_openai_client(self):
+        from openai import AsyncOpenAI
+
+        async def build_and_close():
+            client = _uploader(max_concurrent_requests=35)._new_openai_client()
+            self.assertIsInstance(client, AsyncOpenAI)
+            await client.close()
+            self.assertTrue(client.is_closed())
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}):
+            # Two runs, as upload_documents makes on one uploader, each on its own event loop
+            asyncio.run(build_and_close())
+            asyncio.run(build_and_close())
+
+
+if __name__ == "__main__":
+    unittest.main()